@@ -0,0 +1,111 @@
+"""Process-pool analytics against the serial ways of answering the same query.
+
+Run from the repository root:
+
+    python -m lib.benchmarks.analytics --articles 1000000 --workers 1 2 4
+
+The catalog is built on an ``ArticleStore``. For each query it times:
+
+* the same analytics code with every shard counted in-process,
+* the article index answering on its first read (a cold index build),
+* the warm index, which is what ``analytics`` answers by default,
+* ``analytics`` on a warmed pool of each requested size.
+
+Speedup is relative to the in-process run, which does exactly the
+counting and merging the pool does. It can grow with cores only up to
+the cost of shipping column slices and partial counts between processes.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lib.benchmarks.scale import build_catalog
+from lib.classes import analytics
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.store import ArticleStore
+
+
+def best_of(call, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class InProcess:
+    # Executor stand-in that counts the shards one after another
+    map = staticmethod(map)
+
+
+def run(articles, workers, repeat, seed):
+    Article.all, Author.all, Magazine.all = ArticleStore(), [], []
+    _, _, rows = build_catalog(articles, 1.1, random.Random(seed))
+    Article.bulk_create(rows)
+
+    start = time.perf_counter()
+    Magazine.top_publisher()
+    result = {
+        "articles": articles,
+        "cpus": os.cpu_count(),
+        "index_build_seconds": time.perf_counter() - start,
+        "index_seconds": {
+            "top_publisher": best_of(analytics.top_publisher, repeat),
+            "contributing_authors": best_of(analytics.contributing_authors, repeat),
+        },
+        "serial_seconds": {
+            "top_publisher": best_of(
+                lambda: analytics.top_publisher(executor=InProcess(), workers=1), repeat),
+            "contributing_authors": best_of(
+                lambda: analytics.contributing_authors(executor=InProcess(), workers=1), repeat),
+        },
+        "pool_seconds": {},
+    }
+    for size in workers:
+        with ProcessPoolExecutor(max_workers=size) as pool:
+            # Warm the workers up so process start-up isn't timed
+            analytics.top_publisher(executor=pool, workers=size)
+            result["pool_seconds"][size] = {
+                "top_publisher": best_of(
+                    lambda: analytics.top_publisher(executor=pool, workers=size), repeat),
+                "contributing_authors": best_of(
+                    lambda: analytics.contributing_authors(executor=pool, workers=size), repeat),
+            }
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    saved = Article.all, Author.all, Magazine.all
+    try:
+        result = run(args.articles, args.workers, args.repeat, args.seed)
+    finally:
+        Article.all, Author.all, Magazine.all = saved
+
+    print(f"{args.articles:,} articles on {result['cpus']} cpu(s); "
+          f"cold index build {result['index_build_seconds']:.2f}s")
+    print(f"{'query':<22}{'workers':>8}{'seconds':>10}{'speedup':>9}")
+    for query, baseline in result["serial_seconds"].items():
+        index = result["index_seconds"][query]
+        print(f"{query:<22}{'index':>8}{index:>10.3f}{baseline / index:>9.2f}")
+        print(f"{'':<22}{'serial':>8}{baseline:>10.3f}{1:>9.2f}")
+        for size, timings in result["pool_seconds"].items():
+            print(f"{'':<22}{size:>8}{timings[query]:>10.3f}{baseline / timings[query]:>9.2f}")
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
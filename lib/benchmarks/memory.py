@@ -0,0 +1,107 @@
+"""Bytes per object for the slotted domain classes versus the original layout.
+
+Run from the repository root:
+
+    python -m lib.benchmarks.memory [--count N]
+
+The "__dict__" column measures standalone copies of the classes as they
+were before slotting, with every field in the instance ``__dict__``. The
+"__slots__" column builds the current classes field by field, the way
+``snapshot.load`` does, so the registry lists and the name and category
+indexes are not counted against the objects. Field values are shared
+between objects, except for each article's sequence number, which the
+slotted layout adds.
+"""
+import argparse
+import tracemalloc
+
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import Registry
+
+
+# The original instance layouts; only the fields matter for the size
+
+class BaselineAuthor:
+    def __init__(self, name):
+        self._name = name
+
+
+class BaselineMagazine:
+    def __init__(self, name, category):
+        self._name = name
+        self._category = category
+
+
+class BaselineArticle:
+    def __init__(self, author, magazine, title):
+        self._author = author
+        self._magazine = magazine
+        self._title = title
+
+
+def slotted_author(name, registry):
+    author = Author.__new__(Author)
+    author._name = name
+    author._registry = registry
+    return author
+
+
+def slotted_magazine(name, category, registry):
+    magazine = Magazine.__new__(Magazine)
+    magazine._name = name
+    magazine._category = category
+    magazine._registry = registry
+    return magazine
+
+
+def slotted_article(author, magazine, title):
+    article = Article.__new__(Article)
+    article._author = author
+    article._magazine = magazine
+    article._title = title
+    article._seq = next(Article._sequence)
+    return article
+
+
+def bytes_per_object(factory, count):
+    # Allocated up front so the list holding the objects doesn't grow
+    objects = [None] * count
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for position in range(count):
+        objects[position] = factory()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def measure(count):
+    registry = Registry.current()
+    author = slotted_author("Carrie Bradshaw", registry)
+    magazine = slotted_magazine("Vogue", "Fashion", registry)
+    results = []
+    for name, baseline, slotted in (
+        ("Author", lambda: BaselineAuthor("Carrie Bradshaw"),
+         lambda: slotted_author("Carrie Bradshaw", registry)),
+        ("Magazine", lambda: BaselineMagazine("Vogue", "Fashion"),
+         lambda: slotted_magazine("Vogue", "Fashion", registry)),
+        ("Article", lambda: BaselineArticle(author, magazine, "The Dress Dilemma"),
+         lambda: slotted_article(author, magazine, "The Dress Dilemma")),
+    ):
+        results.append((name, bytes_per_object(baseline, count),
+                        bytes_per_object(slotted, count)))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'class':<10}{'__dict__':>12}{'__slots__':>12}{'saved':>10}")
+    for name, before, after in measure(args.count):
+        print(f"{name:<10}{before:>12.1f}{after:>12.1f}{1 - after / before:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Throughput, latency and memory of the domain model on synthetic catalogs.
+
+Run from the repository root:
+
+    python -m lib.benchmarks.scale --sizes 1000 100000 --output bench.json
+
+Authors and magazines are drawn from Zipf distributions, so a few of them
+own most of the articles as in real catalogs. Each size is built from
+scratch and every query is timed per call.
+"""
+import argparse
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from lib.classes.many_to_many import Article, Author, Magazine
+
+
+CATEGORIES = ["Fashion", "News", "Home", "Technology", "Food", "Travel", "Sports", "Culture"]
+
+
+def zipf_sampler(n, exponent, rng):
+    # Rank r is drawn with weight 1 / r**exponent
+    cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, n + 1)))
+    total = cumulative[-1]
+    return lambda: bisect(cumulative, rng.random() * total)
+
+
+def build_catalog(articles, exponent, rng):
+    authors = [Author(f"Author {i}") for i in range(max(1, articles // 20))]
+    magazines = [Magazine(f"Magazine {i}", CATEGORIES[i % len(CATEGORIES)])
+                 for i in range(max(1, int(articles ** 0.5)))]
+    pick_author = zipf_sampler(len(authors), exponent, rng)
+    pick_magazine = zipf_sampler(len(magazines), exponent, rng)
+    rows = [(authors[pick_author()], magazines[pick_magazine()], f"Article number {i}")
+            for i in range(articles)]
+    return authors, magazines, rows
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def summarize(samples):
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "ops_per_sec": len(samples) / total if total else None,
+        "p50_us": percentile(samples, 0.50) * 1e6,
+        "p99_us": percentile(samples, 0.99) * 1e6,
+    }
+
+
+def time_calls(call, subjects):
+    samples = []
+    clock = time.perf_counter
+    for subject in subjects:
+        start = clock()
+        call(subject)
+        samples.append(clock() - start)
+    return summarize(samples)
+
+
+QUERIES = {
+    "Author.articles": (0, lambda author: author.articles),
+    "Author.magazines": (0, lambda author: author.magazines),
+    "Author.topic_areas": (0, lambda author: author.topic_areas()),
+    "Magazine.contributors": (1, lambda magazine: magazine.contributors),
+    "Magazine.contributing_authors": (1, lambda magazine: magazine.contributing_authors()),
+    "Magazine.top_publisher": (None, lambda _: Magazine.top_publisher()),
+}
+
+
+def run_size(articles, calls, exponent, seed, trace_memory):
+    rng = random.Random(seed)
+    Article.all, Author.all, Magazine.all = [], [], []
+    if trace_memory:
+        tracemalloc.start()
+
+    authors, magazines, rows = build_catalog(articles, exponent, rng)
+    result = {"articles": articles, "authors": len(authors), "magazines": len(magazines)}
+
+    start = time.perf_counter()
+    for author, magazine, title in rows:
+        Article(author, magazine, title)
+    elapsed = time.perf_counter() - start
+    result["construct"] = {"seconds": elapsed, "rows_per_sec": articles / elapsed}
+
+    # The index catches up lazily, so the first read pays for the whole load
+    start = time.perf_counter()
+    Magazine.top_publisher()
+    result["index_build_seconds"] = time.perf_counter() - start
+
+    # Query the same skewed population the articles were drawn from
+    pick_author = zipf_sampler(len(authors), exponent, rng)
+    pick_magazine = zipf_sampler(len(magazines), exponent, rng)
+    subjects = (
+        [authors[pick_author()] for _ in range(calls)],
+        [magazines[pick_magazine()] for _ in range(calls)],
+        [None] * calls,
+    )
+    result["queries"] = {name: time_calls(call, subjects[which if which is not None else 2])
+                         for name, (which, call) in QUERIES.items()}
+
+    if trace_memory:
+        result["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    if resource is not None:
+        # ru_maxrss is kilobytes on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        result["peak_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="catalog sizes in articles (up to 10_000_000)")
+    parser.add_argument("--calls", type=int, default=1_000, help="timed calls per query")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for authors and magazines")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record the tracemalloc peak (slows construction down)")
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "settings": {"calls": args.calls, "zipf": args.zipf, "seed": args.seed},
+        "runs": [],
+    }
+    saved = Article.all, Author.all, Magazine.all
+    try:
+        for size in args.sizes:
+            run = run_size(size, args.calls, args.zipf, args.seed, args.trace_memory)
+            report["runs"].append(run)
+            print(f"{size:>10} articles: {run['construct']['rows_per_sec']:,.0f} rows/s, "
+                  f"top_publisher p99 {run['queries']['Magazine.top_publisher']['p99_us']:.1f}us")
+    finally:
+        Article.all, Author.all, Magazine.all = saved
+
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""Asyncio facade over a registry's catalog.
+
+    catalog = Catalog()
+    magazine = await catalog.top_publisher()
+    areas = await author.atopic_areas()
+    created = await catalog.ingest(rows)
+
+Queries run on a worker thread inside the catalog's registry, so the
+event loop keeps serving while a large catalog is scanned. Identical
+queries that arrive while one is already running (same method, same
+arguments, same loop) wait for that computation instead of starting
+their own.
+
+``ingest`` feeds ``Article.bulk_create`` from a plain or async iterable
+of (author, magazine, title) rows. Batches go through a queue holding at
+most ``max_pending`` of them, so a fast producer waits on the writer
+instead of buffering the whole input.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .many_to_many import Article, Author, BulkCreateError, Magazine
+from .registry import Registry
+
+_defaults_lock = threading.Lock()
+
+
+class Catalog:
+    def __init__(self, registry=None, executor=None, max_workers=None):
+        self.registry = registry if registry is not None else Registry.current()
+        # An executor passed in is the caller's to shut down
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._max_workers = max_workers
+        self._inflight = {}
+
+    @classmethod
+    def of(cls, registry):
+        # The shared catalog behind Author.atopic_areas and friends. It lives
+        # on the registry, so dropping a tenant drops its catalog and pool too
+        with _defaults_lock:
+            if registry.catalog is None:
+                registry.catalog = cls(registry)
+            return registry.catalog
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._max_workers, thread_name_prefix="catalog")
+        return self._executor
+
+    def _run(self, function, args):
+        with self.registry:
+            return function(*args)
+
+    async def call(self, function, *args):
+        loop = asyncio.get_running_loop()
+        key = (loop, function, args)
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.run_in_executor(self._pool(), self._run, function, args)
+            self._inflight[key] = future
+
+            def finished(_, key=key, future=future):
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.add_done_callback(finished)
+        # Shielded so one caller giving up doesn't cancel the others
+        return await asyncio.shield(future)
+
+    # --- Queries ---
+
+    async def top_publisher(self):
+        return await self.call(Magazine.top_publisher)
+
+    async def top_publishers(self, n, since=None):
+        return await self.call(Magazine.top_publishers, n, since)
+
+    async def most_prolific(self, n, since=None):
+        return await self.call(Author.most_prolific, n, since)
+
+    async def contributing_authors(self, magazine, threshold=2):
+        return await self.call(magazine.contributing_authors, threshold)
+
+    async def contributing_authors_all(self, threshold=2):
+        return await self.call(Magazine.contributing_authors_all, threshold)
+
+    async def topic_areas(self, author):
+        return await self.call(author.topic_areas)
+
+    async def topic_areas_all(self):
+        return await self.call(Author.topic_areas_all)
+
+    async def search(self, query, magazine=None, author=None, prefix=True, fuzzy=False):
+        return await self.call(Article.search, query, magazine, author, prefix, fuzzy)
+
+    # --- Bulk Ingest ---
+
+    async def ingest(self, rows, batch_size=1000, max_pending=4):
+        # Returns how many articles were created. A bad row raises a
+        # BulkCreateError with positions counted from the start of rows,
+        # leaving every earlier batch created.
+        queue = asyncio.Queue(max_pending)
+        writer = asyncio.ensure_future(self._write(queue))
+        try:
+            batch = []
+            async for row in _rows(rows):
+                batch.append(row)
+                if len(batch) == batch_size:
+                    await _put(queue, batch, writer)
+                    batch = []
+            if batch:
+                await _put(queue, batch, writer)
+            await _put(queue, None, writer)
+            return await writer
+        finally:
+            writer.cancel()
+
+    async def _write(self, queue):
+        loop = asyncio.get_running_loop()
+        created = 0
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                return created
+            try:
+                articles = await loop.run_in_executor(self._pool(), self._run,
+                                                      Article.bulk_create, (batch,))
+            except BulkCreateError as error:
+                raise BulkCreateError([(created + index, message)
+                                       for index, message in error.errors]) from None
+            created += len(articles)
+
+    # --- Lifecycle ---
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+async def _rows(rows):
+    if hasattr(rows, '__aiter__'):
+        async for row in rows:
+            yield row
+    else:
+        for row in rows:
+            yield row
+
+
+async def _put(queue, item, writer):
+    # Waits for room in the queue, or stops early if the writer has failed
+    put = asyncio.ensure_future(queue.put(item))
+    await asyncio.wait({put, writer}, return_when=asyncio.FIRST_COMPLETED)
+    if not put.done():
+        put.cancel()
+        writer.result()
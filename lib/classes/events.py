@@ -0,0 +1,92 @@
+"""Change events for anything that keeps a view derived from the catalog.
+
+Each registry has an ``EventBus`` at ``registry.events``. Subscribers get
+lists of ``Event`` tuples:
+
+    Event("created", article, None, None, None)
+    Event("changed", article, "author", old_author, new_author)
+    Event("changed", magazine, "category", "Fashion", "Style")
+    Event("deleted", article, None, None, None)
+
+Outside a batch every event is delivered on its own. Inside
+``with registry.events.batch():`` the calling thread's events are held
+back and delivered once at the end, coalesced so each subscriber sees the
+net change: repeated reassignments collapse into one old -> new delta,
+changes that end where they started are dropped, and changes to an
+article created (or deleted) in the same batch fold into that event.
+``Article.bulk_create`` delivers its whole batch at once.
+
+Publishers check ``bus.subscribers`` before building an event, so an
+unobserved catalog only pays for one attribute test per write.
+"""
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+
+Event = namedtuple('Event', ['kind', 'target', 'field', 'old', 'new'])
+
+
+def coalesce(events):
+    # Net effect of a run of events, in the order each target first changed
+    merged = {}
+    for event in events:
+        whole = (event.target, None)
+        if event.kind == 'created':
+            merged[whole] = event
+        elif event.kind == 'deleted':
+            created = merged.pop(whole, None)
+            for key in [key for key in merged if key[0] is event.target]:
+                del merged[key]
+            if created is None:
+                merged[whole] = event
+        elif whole not in merged:
+            key = (event.target, event.field)
+            earlier = merged.get(key)
+            if earlier is not None:
+                event = event._replace(old=earlier.old)
+            merged[key] = event
+    return [event for event in merged.values()
+            if event.kind != 'changed' or event.old != event.new]
+
+
+class EventBus:
+    def __init__(self):
+        # Replaced rather than mutated, so publishers can iterate without a lock
+        self.subscribers = ()
+        self._batches = threading.local()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        # callback(events) is called with a list of Events; returns callback
+        with self._lock:
+            self.subscribers = self.subscribers + (callback,)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            subscribers = list(self.subscribers)
+            subscribers.remove(callback)
+            self.subscribers = tuple(subscribers)
+
+    def publish(self, events):
+        pending = getattr(self._batches, 'pending', None)
+        if pending is not None:
+            pending.extend(events)
+            return
+        for callback in self.subscribers:
+            callback(list(events))
+
+    @contextmanager
+    def batch(self):
+        # Nested batches join the outermost one
+        if getattr(self._batches, 'pending', None) is not None:
+            yield
+            return
+        self._batches.pending = pending = []
+        try:
+            yield
+        finally:
+            self._batches.pending = None
+            events = coalesce(pending)
+            if events:
+                self.publish(events)
@@ -0,0 +1,721 @@
+"""Incrementally maintained lookup structures for the magazine domain.
+
+The indexes follow a source list (``Article.all``) instead of owning it.
+Code that replaces that list, as the tests do between cases, is noticed
+on the next read and the index rebuilds itself. The registry keeps its
+lists as ``TrackedList``s, which count every change other than an
+append, so clearing one and refilling it in place is noticed too. Other
+sequences are only checked by length and last item.
+
+Each index has one writer lock. Catching up and the setter hooks run
+under it. Readers that only snapshot a bucket (``list(bucket)``, which
+is atomic under the GIL) never take it once the index is caught up.
+"""
+import heapq
+import operator
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, namedtuple
+
+from .search import TitleIndex
+from .store import Store
+
+# One page of an ordered article query; pass next_cursor back as `after`
+# to get the following page, it is None on the last one
+Page = namedtuple('Page', ['articles', 'next_cursor'])
+
+_SEQ = operator.attrgetter('_seq')
+_AUTHOR = operator.attrgetter('_author')
+_MAGAZINE = operator.attrgetter('_magazine')
+
+ORDERS = {
+    'insertion': lambda article: article._seq,
+    'title': lambda article: (article._title, article._seq),
+}
+
+
+# Argument checks shared with the SQLite store's stand-in index
+
+def check_n(n):
+    if not isinstance(n, int) or n < 1:
+        raise Exception("N must be a positive integer")
+
+
+def check_order(order):
+    if order not in ORDERS:
+        raise Exception(f"Order must be one of {', '.join(ORDERS)}")
+
+
+def check_limit(limit):
+    if not isinstance(limit, int) or limit < 1:
+        raise Exception("Limit must be a positive integer")
+
+
+def _rewriting(name):
+    method = getattr(list, name)
+
+    def rewrite(self, *args):
+        result = method(self, *args)
+        self.rewrites += 1
+        return result
+    rewrite.__name__ = name
+    return rewrite
+
+
+class TrackedList(list):
+    """A list that counts its changes other than appends.
+
+    An index that sees ``rewrites`` move since its last catch-up can't
+    trust what it indexed and starts over.
+    """
+
+    __slots__ = ('rewrites',)
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.rewrites = 0
+
+    clear = _rewriting('clear')
+    insert = _rewriting('insert')
+    pop = _rewriting('pop')
+    remove = _rewriting('remove')
+    reverse = _rewriting('reverse')
+    sort = _rewriting('sort')
+    __setitem__ = _rewriting('__setitem__')
+    __delitem__ = _rewriting('__delitem__')
+    __imul__ = _rewriting('__imul__')
+
+
+class SyncedIndex(ABC):
+    def __init__(self, source):
+        # `source` is a callable returning the list the index follows
+        self._source = source
+        self._followed = None
+        self._size = 0
+        self._last = None
+        self._rewrites = 0
+        self.lock = threading.RLock()
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        """Drop everything indexed so far."""
+
+    @abstractmethod
+    def add(self, item):
+        """Index one item from the followed list."""
+
+    def add_many(self, items):
+        # Overridden where a batch can be indexed faster than item by item
+        for item in items:
+            self.add(item)
+
+    def forget(self):
+        # Drops the followed list and everything indexed from it; the next
+        # sync starts from scratch
+        with self.lock:
+            self._followed = None
+            self._rewrites = 0
+            self._size = 0
+            self._last = None
+            self.reset()
+
+    def sync(self):
+        items = self._source()
+        # Fast path for readers: nothing new since the last catch-up
+        if (items is self._followed and len(items) == self._size
+                and getattr(items, 'rewrites', 0) == self._rewrites
+                and (not self._size or items[self._size - 1] is self._last)):
+            return
+        with self.lock:
+            self._catch_up(self._source())
+
+    def _catch_up(self, items):
+        rewrites = getattr(items, 'rewrites', 0)
+        size = len(items)
+
+        # Replaced, shrunk, or cleared and refilled behind our back: start over
+        if (items is not self._followed or rewrites != self._rewrites or size < self._size
+                or (self._size and items[self._size - 1] is not self._last)):
+            self._followed = items
+            self._rewrites = rewrites
+            self._size = 0
+            self._last = None
+            self.reset()
+
+        # Bounded by the length read above; anything appended meanwhile is
+        # picked up by the next sync
+        if size > self._size:
+            self.add_many(items[self._size:size])
+            self._size = size
+            self._last = items[size - 1]
+
+
+class RankedCounter:
+    """Per-key counts bucketed by value, so the leaders come back without sorting.
+
+    Keys with equal counts rank in the order they reached that count.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self._buckets = {}
+        self._max = 0
+
+    def _move(self, key, old, new):
+        if old:
+            bucket = self._buckets[old]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[old]
+        if new:
+            self.counts[key] = new
+            self._buckets.setdefault(new, {})[key] = None
+        else:
+            del self.counts[key]
+
+    def increment(self, key):
+        old = self.counts.get(key, 0)
+        self._move(key, old, old + 1)
+        if old + 1 > self._max:
+            self._max = old + 1
+
+    def increment_many(self, keys):
+        # Ends in the same state as incrementing each key in turn: a key
+        # reaches its final count at its last occurrence, so that decides
+        # its place among equal counts
+        added = Counter(keys)
+        last = dict(zip(keys, range(len(keys))))
+        for key in sorted(added, key=last.__getitem__):
+            old = self.counts.get(key, 0)
+            self._move(key, old, old + added[key])
+            if old + added[key] > self._max:
+                self._max = old + added[key]
+
+    def decrement(self, key):
+        old = self.counts[key]
+        self._move(key, old, old - 1)
+        # Counts move one step at a time, so an emptied top bucket means the
+        # leader is now exactly one below it
+        if old == self._max and old not in self._buckets:
+            self._max = old - 1
+
+    def top(self):
+        if not self._max:
+            return None
+        return next(iter(self._buckets[self._max]))
+
+    def most_common(self, n):
+        leaders = []
+        for count in sorted(self._buckets, reverse=True):
+            for key in self._buckets[count]:
+                if len(leaders) == n:
+                    return leaders
+                leaders.append(key)
+        return leaders
+
+
+class SequenceBuckets:
+    """Magazine and author article counts over fixed ranges of sequence numbers.
+
+    The counts are kept per bucket and again per aligned run of 2, 4, 8, ...
+    buckets. A window starting at `since` walks the articles of the bucket
+    it starts in and adds up at most two runs per level after it, so it
+    costs O(log buckets) count dicts however wide it is. Every write bumps
+    one run per level.
+    """
+
+    WIDTH = 1024
+
+    class Span:
+        __slots__ = ('magazines', 'authors')
+
+        def __init__(self):
+            self.magazines = {}
+            self.authors = {}
+
+    class Bucket(Span):
+        __slots__ = ('seqs', 'articles')
+
+        def __init__(self):
+            super().__init__()
+            self.seqs = []
+            self.articles = []
+
+    def __init__(self):
+        self._numbers = []
+        self._buckets = {}
+        # _levels[k] maps `number >> k` to the counts of that run of buckets;
+        # the top level only ever holds run 0, which covers every bucket
+        self._levels = [self._buckets]
+
+    def _bump(self, counts, key, delta):
+        count = counts.get(key, 0) + delta
+        if count:
+            counts[key] = count
+        else:
+            del counts[key]
+
+    def _bucket(self, number):
+        bucket = self._buckets.get(number)
+        if bucket is None:
+            bucket = self._buckets[number] = self.Bucket()
+            insort(self._numbers, number)
+            while number >> (len(self._levels) - 1):
+                # A new top run starts out as everything counted so far
+                top = self._levels[-1].get(0)
+                span = self.Span()
+                if top is not None:
+                    span.magazines = dict(top.magazines)
+                    span.authors = dict(top.authors)
+                self._levels.append({0: span} if top is not None else {})
+        return bucket
+
+    def _shift(self, number, counts, changes):
+        # Applies (entity, delta) pairs to the bucket and every run above it
+        for level, spans in enumerate(self._levels):
+            key = number >> level
+            span = spans.get(key)
+            if span is None:
+                span = spans[key] = self.Span()
+            for entity, delta in changes:
+                self._bump(getattr(span, counts), entity, delta)
+            if level and not span.magazines and not span.authors:
+                del spans[key]
+
+    def add(self, article):
+        seq = article._seq
+        number = seq // self.WIDTH
+        bucket = self._bucket(number)
+        seqs = bucket.seqs
+        # Appends are in sequence order unless creators raced each other
+        position = len(seqs) if not seqs or seqs[-1] < seq else bisect_right(seqs, seq)
+        seqs.insert(position, seq)
+        bucket.articles.insert(position, article)
+        self._shift(number, 'magazines', ((article.magazine, 1),))
+        self._shift(number, 'authors', ((article.author, 1),))
+
+    def add_many(self, articles):
+        seqs = list(map(_SEQ, articles))
+        if any(map(operator.ge, seqs, seqs[1:])):
+            # Creators raced each other; let add place them one by one
+            for article in articles:
+                self.add(article)
+            return
+        start = 0
+        while start < len(seqs):
+            number = seqs[start] // self.WIDTH
+            end = bisect_left(seqs, (number + 1) * self.WIDTH, start)
+            bucket = self._bucket(number)
+            if bucket.seqs and bucket.seqs[-1] > seqs[start]:
+                for article in articles[start:end]:
+                    self.add(article)
+            else:
+                chunk = articles[start:end]
+                bucket.seqs.extend(seqs[start:end])
+                bucket.articles.extend(chunk)
+                self._shift(number, 'magazines', Counter(map(_MAGAZINE, chunk)).items())
+                self._shift(number, 'authors', Counter(map(_AUTHOR, chunk)).items())
+            start = end
+
+    def remove(self, article):
+        number = article._seq // self.WIDTH
+        bucket = self._buckets[number]
+        position = bisect_left(bucket.seqs, article._seq)
+        del bucket.seqs[position]
+        del bucket.articles[position]
+        self._shift(number, 'magazines', ((article.magazine, -1),))
+        self._shift(number, 'authors', ((article.author, -1),))
+        if not bucket.seqs:
+            del self._buckets[number]
+            del self._numbers[bisect_left(self._numbers, number)]
+
+    def moved(self, article, counts, old, new):
+        # `counts` is 'magazines' or 'authors'
+        self._shift(article._seq // self.WIDTH, counts, ((old, -1), (new, 1)))
+
+    def counts(self, field, since):
+        # {entity: articles with seq >= since}, for field 'magazine' or 'author',
+        # in order of first appearance run by run
+        since = max(since, 0)
+        first = since // self.WIDTH
+        totals = {}
+        bucket = self._buckets.get(first)
+        if bucket is not None:
+            for article in bucket.articles[bisect_left(bucket.seqs, since):]:
+                entity = getattr(article, field)
+                totals[entity] = totals.get(entity, 0) + 1
+        # Every bucket after `first`, left to right: an odd run is the last
+        # one under its parent, so it's taken whole and the climb goes on
+        # from the next parent
+        top = len(self._levels) - 1
+        number = first + 1
+        for level, spans in enumerate(self._levels):
+            if number & 1 or level == top:
+                span = spans.get(number)
+                if span is not None:
+                    for entity, count in getattr(span, field + 's').items():
+                        totals[entity] = totals.get(entity, 0) + count
+                number += 1
+            number >>= 1
+        return totals
+
+
+class ArticleIndex(SyncedIndex):
+    """Maps every author and magazine to the articles that belong to it.
+
+    Articles are picked up lazily from the tail of ``Article.all`` on the
+    next read, so construction stays a plain append. Reassignments go
+    through `author_changed` / `magazine_changed`.
+
+    Derived lists are memoized per entity against a generation counter that
+    only moves when that entity's own articles change.
+    """
+
+    def __init__(self, source):
+        self.hits = 0
+        self.misses = 0
+        super().__init__(source)
+
+    def reset(self):
+        self.by_author = {}
+        self.by_magazine = {}
+        self.magazine_counts = RankedCounter()
+        self.author_counts = RankedCounter()
+        # Counts per range of sequence numbers, for the windowed rankings
+        self.windows = SequenceBuckets()
+        # Sparse (magazine, author) article counts, held from both sides
+        self.authors_by_magazine = {}
+        self.magazines_by_author = {}
+        self.categories_by_author = {}
+        self.generations = {}
+        self._memo = {}
+        self._ordered = {}
+        self.titles = TitleIndex()
+        # Deleted articles still waiting in the followed list for compaction
+        self.tombstones = 0
+
+    def add(self, article):
+        if article._seq is None:
+            self.tombstones += 1
+            return
+        self.by_author.setdefault(article.author, {})[article] = None
+        self.by_magazine.setdefault(article.magazine, {})[article] = None
+        self.magazine_counts.increment(article.magazine)
+        self.author_counts.increment(article.author)
+        self._count_pair(article.magazine, article.author, 1)
+        self.titles.add(article)
+        self.windows.add(article)
+
+    def add_many(self, articles):
+        # Bulk version of add for a cold build or a large catch-up: the
+        # counters are filled from whole columns at C speed and only the
+        # per-entity buckets are walked article by article
+        live = [article for article in articles if article._seq is not None]
+        self.tombstones += len(articles) - len(live)
+        authors = list(map(_AUTHOR, live))
+        magazines = list(map(_MAGAZINE, live))
+        by_author, by_magazine = self.by_author, self.by_magazine
+        for article, author, magazine in zip(live, authors, magazines):
+            bucket = by_author.get(author)
+            if bucket is None:
+                bucket = by_author[author] = {}
+            bucket[article] = None
+            bucket = by_magazine.get(magazine)
+            if bucket is None:
+                bucket = by_magazine[magazine] = {}
+            bucket[article] = None
+        self.magazine_counts.increment_many(magazines)
+        self.author_counts.increment_many(authors)
+        # Pairs come out in order of first appearance, as add would meet them
+        for (magazine, author), count in Counter(zip(magazines, authors)).items():
+            self._count_pair(magazine, author, count)
+        self.titles.add_many(live)
+        self.windows.add_many(live)
+
+    def _count(self, mapping, outer, inner, delta):
+        counts = mapping.setdefault(outer, {})
+        count = counts.get(inner, 0) + delta
+        if count:
+            counts[inner] = count
+        else:
+            del counts[inner]
+            if not counts:
+                del mapping[outer]
+
+    def _count_pair(self, magazine, author, delta):
+        self._count(self.authors_by_magazine, magazine, author, delta)
+        self._count(self.magazines_by_author, author, magazine, delta)
+        # Article counts per category for each author, so topic_areas never
+        # has to look at the magazines themselves
+        self._count(self.categories_by_author, author, magazine.category, delta)
+        # Bumped only after the counts change: a lock-free reader that
+        # computes in between caches under the old generation, which the
+        # bump then invalidates
+        generations = self.generations
+        generations[magazine] = generations.get(magazine, 0) + 1
+        generations[author] = generations.get(author, 0) + 1
+
+    def _move(self, mapping, article, old, new):
+        if old is new:
+            return False
+        articles = mapping.get(old)
+        # Articles that are no longer in the followed list stay out of the index
+        if not articles or article not in articles:
+            return False
+        del articles[article]
+        if not articles:
+            del mapping[old]
+        mapping.setdefault(new, {})[article] = None
+        return True
+
+    # --- Write Hooks ---
+
+    def author_changed(self, article, old):
+        if self._move(self.by_author, article, old, article.author):
+            self.author_counts.decrement(old)
+            self.author_counts.increment(article.author)
+            self._count_pair(article.magazine, old, -1)
+            self._count_pair(article.magazine, article.author, 1)
+            self.windows.moved(article, 'authors', old, article.author)
+
+    def magazine_changed(self, article, old):
+        if self._move(self.by_magazine, article, old, article.magazine):
+            self.magazine_counts.decrement(old)
+            self.magazine_counts.increment(article.magazine)
+            self._count_pair(old, article.author, -1)
+            self._count_pair(article.magazine, article.author, 1)
+            self.windows.moved(article, 'magazines', old, article.magazine)
+
+    def _discard(self, mapping, key, article):
+        articles = mapping[key]
+        del articles[article]
+        if not articles:
+            del mapping[key]
+
+    def delete(self, articles, compact=False):
+        # Unhooks the articles from every structure and tombstones them in
+        # the followed list. The list is compacted once tombstones make up
+        # an eighth of it, which keeps deletes O(1) amortized.
+        with self.lock:
+            self.sync()
+            deleted = 0
+            for article in articles:
+                author, magazine = article.author, article.magazine
+                if article not in self.by_author.get(author, ()):
+                    continue
+                self._discard(self.by_author, author, article)
+                self._discard(self.by_magazine, magazine, article)
+                self.magazine_counts.decrement(magazine)
+                self.author_counts.decrement(author)
+                self._count_pair(magazine, author, -1)
+                self.titles.remove(article)
+                self.windows.remove(article)
+                if isinstance(self._followed, Store):
+                    self._followed.row_deleted(article)
+                article._seq = None
+                deleted += 1
+            self.tombstones += deleted
+            if self.tombstones and (compact or self.tombstones * 8 > self._size):
+                self.compact()
+            return deleted
+
+    def compact(self):
+        with self.lock:
+            self.sync()
+            items = self._followed
+            size = self._size
+            live = [article for article in items[:size] if article._seq is not None]
+            # Only the synced prefix is replaced, so articles appended by
+            # other threads in the meantime are kept
+            items[:size] = live
+            self._rewrites = getattr(items, 'rewrites', 0)
+            self._size = len(live)
+            self._last = live[-1] if live else None
+            self.tombstones = 0
+
+    def category_changed(self, magazine, old):
+        new = magazine.category
+        if old == new:
+            return
+        for author, count in self.authors_by_magazine.get(magazine, {}).items():
+            self._count(self.categories_by_author, author, old, -count)
+            self._count(self.categories_by_author, author, new, count)
+
+    # --- Lookups ---
+
+    def articles_by_author(self, author):
+        self.sync()
+        return list(self.by_author.get(author, ()))
+
+    def articles_by_magazine(self, magazine):
+        self.sync()
+        return list(self.by_magazine.get(magazine, ()))
+
+    def _snapshot(self, entity, name, compute):
+        # A tuple of compute(), cached until the entity's generation moves
+        self.sync()
+        generation = self.generations.get(entity, 0)
+        cached = self._memo.get((entity, name))
+        if cached is not None and cached[0] == generation:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        value = tuple(compute())
+        self._memo[(entity, name)] = (generation, value)
+        return value
+
+    def _memoized(self, entity, name, compute):
+        # A fresh list each time, so callers can't mutate the cached copy
+        return list(self._snapshot(entity, name, compute))
+
+    # Lazy variants. They walk the cached snapshot rather than the live
+    # index, so later writes and catch-ups can't break an iteration in
+    # progress; articles added meanwhile just aren't seen.
+
+    def iter_by(self, mapping, entity):
+        return iter(self._snapshot(entity, ('iter', mapping),
+                                   lambda: getattr(self, mapping).get(entity, ())))
+
+    def has(self, mapping, entity):
+        self.sync()
+        return entity in getattr(self, mapping)
+
+    def magazines_of(self, author):
+        return self._memoized(author, 'magazines',
+                              lambda: self.magazines_by_author.get(author, ()))
+
+    def contributors_of(self, magazine):
+        return self._memoized(magazine, 'contributors',
+                              lambda: self.authors_by_magazine.get(magazine, ()))
+
+    def titles_of(self, magazine, order):
+        return self._memoized(magazine, ('titles', order),
+                              lambda: (article.title for article in
+                                       self.ordered('by_magazine', magazine, order)[1]))
+
+    def ordered(self, mapping, entity, order):
+        # Sorted once per generation of the entity; returns (keys, articles)
+        check_order(order)
+        self.sync()
+        generation = self.generations.get(entity, 0)
+        cached = self._ordered.get((mapping, entity, order))
+        if cached is None or cached[0] != generation:
+            key = ORDERS[order]
+            articles = sorted(getattr(self, mapping).get(entity, ()), key=key)
+            cached = (generation, [key(article) for article in articles], articles)
+            self._ordered[(mapping, entity, order)] = cached
+        return cached[1], cached[2]
+
+    def page(self, mapping, entity, after, limit, order):
+        check_limit(limit)
+        keys, articles = self.ordered(mapping, entity, order)
+        start = 0 if after is None else bisect_right(keys, after)
+        end = start + limit
+        return Page(articles[start:end], keys[end - 1] if end < len(keys) else None)
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._memo)}
+
+    def categories_of(self, author):
+        self.sync()
+        return list(self.categories_by_author.get(author, ()))
+
+    def contributions(self, magazine, author):
+        self.sync()
+        return self.authors_by_magazine.get(magazine, {}).get(author, 0)
+
+    def authors_above(self, magazine, threshold):
+        self.sync()
+        # Snapshot the items in one C-level call before filtering in Python
+        counts = list(self.authors_by_magazine.get(magazine, {}).items())
+        return [author for author, count in counts if count > threshold]
+
+    # Catalog-wide variants read every entity under one lock, so the whole
+    # answer comes from a single consistent state of the index
+
+    def categories_of_all(self, authors):
+        self.sync()
+        with self.lock:
+            categories = self.categories_by_author
+            return {author: list(categories.get(author, ())) or None for author in authors}
+
+    def authors_above_all(self, magazines, threshold):
+        self.sync()
+        with self.lock:
+            results = {}
+            for magazine in magazines:
+                counts = self.authors_by_magazine.get(magazine, {})
+                contributing = [author for author, count in counts.items() if count > threshold]
+                results[magazine] = contributing if contributing else None
+            return results
+
+    def search(self, query, magazine, author, prefix, fuzzy):
+        self.sync()
+        with self.lock:
+            within = []
+            if magazine is not None:
+                within.append(self.by_magazine.get(magazine, {}))
+            if author is not None:
+                within.append(self.by_author.get(author, {}))
+            return self.titles.search(query, within, prefix, fuzzy)
+
+    def top_magazine(self):
+        self.sync()
+        with self.lock:
+            return self.magazine_counts.top()
+
+    def top_magazines(self, n):
+        check_n(n)
+        self.sync()
+        with self.lock:
+            return self.magazine_counts.most_common(n)
+
+    def top_authors(self, n):
+        check_n(n)
+        self.sync()
+        with self.lock:
+            return self.author_counts.most_common(n)
+
+    def top_since(self, field, n, since):
+        # The n entities with the most articles numbered `since` or later;
+        # ties go to whichever shows up first in the window
+        check_n(n)
+        self.sync()
+        with self.lock:
+            counts = self.windows.counts(field, since)
+        return heapq.nlargest(n, counts, key=counts.get)
+
+
+class AttributeIndex(SyncedIndex):
+    """Groups entities by the current value of one of their attributes."""
+
+    def __init__(self, source, attribute):
+        self.attribute = attribute
+        super().__init__(source)
+
+    def reset(self):
+        self.by_value = {}
+
+    def add(self, entity):
+        self.by_value.setdefault(getattr(entity, self.attribute), {})[entity] = None
+
+    def changed(self, entity, old):
+        entities = self.by_value.get(old)
+        if not entities or entity not in entities:
+            return
+        del entities[entity]
+        if not entities:
+            del self.by_value[old]
+        self.add(entity)
+
+    def first(self, value):
+        # The first entity registered under a value wins
+        self.sync()
+        with self.lock:
+            return next(iter(self.by_value.get(value, ())), None)
+
+    def all(self, value):
+        self.sync()
+        return list(self.by_value.get(value, ()))
@@ -0,0 +1,160 @@
+"""Opt-in call metrics for the relationship and aggregate methods.
+
+    instrumentation.enable()
+    ...
+    instrumentation.stats()["Magazine.top_publisher"]
+    # {'calls': 12, 'total_seconds': 0.0004, 'p50': ..., 'p90': ..., 'p99': ...,
+    #  'max': ..., 'result_size': 12}
+    print(instrumentation.to_prometheus())
+    instrumentation.disable()
+
+``enable`` swaps timing wrappers into the classes and ``disable`` puts the
+original functions back, so while disabled nothing is wrapped at all.
+Percentiles are taken over each method's most recent ``SAMPLES`` calls.
+``result_size`` adds up the lengths of the returned collections (one for a
+single object, zero for None). The indexes answer from maintained
+structures, so this is the work a call hands back rather than a count of
+articles scanned.
+"""
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+from .indexes import Page
+from .many_to_many import Article, Author, Magazine
+
+SAMPLES = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+TARGETS = {
+    Article: ('search',),
+    Author: ('articles', 'magazines', 'topic_areas', 'topic_areas_all', 'most_prolific',
+             'articles_page'),
+    Magazine: ('articles', 'contributors', 'article_titles', 'contributing_authors',
+               'contributing_authors_all', 'contributions', 'top_publisher',
+               'top_publishers', 'articles_page'),
+}
+
+
+class Metric:
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.result_size = 0
+        self.samples = deque(maxlen=SAMPLES)
+        self.lock = threading.Lock()
+
+    def record(self, seconds, size):
+        with self.lock:
+            self.calls += 1
+            self.total_seconds += seconds
+            self.result_size += size
+            self.samples.append(seconds)
+
+    def summary(self):
+        with self.lock:
+            samples = sorted(self.samples)
+            summary = {'calls': self.calls, 'total_seconds': self.total_seconds,
+                       'result_size': self.result_size}
+        for quantile in QUANTILES:
+            # Nearest-rank percentile over the retained samples
+            rank = max(0, int(round(quantile * len(samples))) - 1)
+            summary[f'p{int(quantile * 100)}'] = samples[rank] if samples else 0.0
+        summary['max'] = samples[-1] if samples else 0.0
+        return summary
+
+
+_metrics = {}
+_originals = {}
+_lock = threading.Lock()
+
+
+def _size(result):
+    if result is None:
+        return 0
+    if isinstance(result, Page):
+        return len(result.articles)
+    try:
+        return len(result)
+    except TypeError:
+        return 1
+
+
+def _timed(function, metric):
+    @wraps(function)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        result = function(*args, **kwargs)
+        metric.record(time.perf_counter() - start, _size(result))
+        return result
+    return timed
+
+
+def _wrap(attribute, metric):
+    if isinstance(attribute, property):
+        return property(_timed(attribute.fget, metric), attribute.fset, attribute.fdel,
+                        attribute.__doc__)
+    if isinstance(attribute, classmethod):
+        return classmethod(_timed(attribute.__func__, metric))
+    return _timed(attribute, metric)
+
+
+def enabled():
+    return bool(_originals)
+
+
+def enable():
+    with _lock:
+        if _originals:
+            return
+        for cls, names in TARGETS.items():
+            for name in names:
+                original = cls.__dict__[name]
+                metric = _metrics.setdefault(f'{cls.__name__}.{name}', Metric())
+                _originals[(cls, name)] = original
+                setattr(cls, name, _wrap(original, metric))
+
+
+def disable():
+    with _lock:
+        for (cls, name), original in _originals.items():
+            setattr(cls, name, original)
+        _originals.clear()
+
+
+def reset():
+    with _lock:
+        for metric in _metrics.values():
+            with metric.lock:
+                metric.calls = 0
+                metric.total_seconds = 0.0
+                metric.result_size = 0
+                metric.samples.clear()
+
+
+def stats():
+    # {"Class.method": summary} for every method called while enabled
+    return {name: metric.summary() for name, metric in sorted(_metrics.items())
+            if metric.calls}
+
+
+def to_prometheus(prefix='catalog'):
+    summaries = stats()
+    lines = [
+        f'# HELP {prefix}_call_seconds Latency of instrumented catalog methods.',
+        f'# TYPE {prefix}_call_seconds summary',
+    ]
+    for name, summary in summaries.items():
+        for quantile in QUANTILES:
+            lines.append(f'{prefix}_call_seconds{{method="{name}",quantile="{quantile}"}} '
+                         f'{summary[f"p{int(quantile * 100)}"]!r}')
+        lines.append(f'{prefix}_call_seconds_sum{{method="{name}"}} {summary["total_seconds"]!r}')
+        lines.append(f'{prefix}_call_seconds_count{{method="{name}"}} {summary["calls"]}')
+    lines += [
+        f'# HELP {prefix}_result_size_total Items returned by instrumented catalog methods.',
+        f'# TYPE {prefix}_result_size_total counter',
+    ]
+    for name, summary in summaries.items():
+        lines.append(f'{prefix}_result_size_total{{method="{name}"}} {summary["result_size"]}')
+    return '\n'.join(lines) + '\n'
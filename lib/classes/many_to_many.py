@@ -1,17 +1,45 @@
-class Article:
-    all = []
+from itertools import count
+
+from .events import Event
+from .indexes import Page
+from .registry import Registered, Registry
+from .store import Store
+
+
+class BulkCreateError(Exception):
+    def __init__(self, errors):
+        # errors is a list of (row index, message) pairs
+        self.errors = errors
+        details = "; ".join(f"row {index}: {message}" for index, message in errors)
+        super().__init__(f"{len(errors)} invalid row(s): {details}")
+
+
+class Article(metaclass=Registered):
+    # Weak-referenceable so SQLiteStore can hand out one object per row
+    __slots__ = ('_title', '_author', '_magazine', '_seq', '__weakref__')
+
+    # Article.all is the current registry's article list
+    _registry_field = 'articles'
+    # Insertion order across the whole catalog; cursors are built from it
+    _sequence = count()
 
     def __init__(self, author, magazine, title):
         if not isinstance(author, Author):
             raise Exception("Author must be an instance of Author")
         if not isinstance(magazine, Magazine):
             raise Exception("Magazine must be an instance of Magazine")
+        registry = Registry.current()
+        if author._registry is not registry or magazine._registry is not registry:
+            raise Exception("Author and magazine must belong to the current registry")
 
         self._author = author
         self._magazine = magazine
         self.title = title
+        self._seq = next(Article._sequence)
 
-        Article.all.append(self)
+        registry.articles.append(self)
+        if registry.events.subscribers:
+            registry.events.publish([Event('created', self, None, None, None)])
 
     # --- Properties ---
 
@@ -32,6 +60,20 @@ class Article:
 
         self._title = value
 
+    @property
+    def _registry(self):
+        # Articles live in their author's registry
+        return self._author._registry
+
+    @property
+    def seq(self):
+        return self._seq
+
+    @property
+    def deleted(self):
+        # Deleting clears the sequence number, which doubles as the tombstone
+        return self._seq is None
+
     @property
     def author(self):
         return self._author
@@ -40,7 +82,24 @@ class Article:
     def author(self, value):
         if not isinstance(value, Author):
             raise Exception("Author must be an instance of Author")
-        self._author = value
+        registry = self._registry
+        if value._registry is not registry:
+            raise Exception("Author must belong to the article's registry")
+        index = registry.article_index
+        # Catch the index up first so it still files this article under the old author
+        with index.lock:
+            index.sync()
+            # Checked under the lock, which delete() also holds
+            if self._seq is None:
+                raise Exception("Deleted articles cannot be reassigned")
+            old = self._author
+            self._author = value
+            index.author_changed(self, old)
+            if isinstance(registry.articles, Store):
+                registry.articles.row_changed(self)
+        # Published outside the lock so subscribers can read the catalog freely
+        if registry.events.subscribers:
+            registry.events.publish([Event('changed', self, 'author', old, value)])
 
     @property
     def magazine(self):
@@ -50,11 +109,113 @@ class Article:
     def magazine(self, value):
         if not isinstance(value, Magazine):
             raise Exception("Magazine must be an instance of Magazine")
-        self._magazine = value
+        registry = self._registry
+        if value._registry is not registry:
+            raise Exception("Magazine must belong to the article's registry")
+        index = registry.article_index
+        with index.lock:
+            index.sync()
+            if self._seq is None:
+                raise Exception("Deleted articles cannot be reassigned")
+            old = self._magazine
+            self._magazine = value
+            index.magazine_changed(self, old)
+            if isinstance(registry.articles, Store):
+                registry.articles.row_changed(self)
+        if registry.events.subscribers:
+            registry.events.publish([Event('changed', self, 'magazine', old, value)])
+
+    @classmethod
+    def cache_info(cls):
+        # Hit/miss counts for the memoized magazines, contributors and article_titles
+        return Registry.current().article_index.cache_info()
+
+    @classmethod
+    def search(cls, query, magazine=None, author=None, prefix=True, fuzzy=False):
+        # Articles whose titles contain every word of the query (or a word
+        # starting with it), optionally limited to one magazine and/or author
+        return Registry.current().article_index.search(query, magazine, author, prefix, fuzzy)
+
+    # --- Removal ---
+
+    def delete(self):
+        registry = self._registry
+        if registry.article_index.delete([self]) != 1:
+            return False
+        if registry.events.subscribers:
+            registry.events.publish([Event('deleted', self, None, None, None)])
+        return True
+
+    @classmethod
+    def delete_where(cls, predicate):
+        # One pass over Article.all; returns how many articles were deleted
+        registry = Registry.current()
+        matches = [article for article in list(registry.articles)
+                   if not article.deleted and predicate(article)]
+        deleted = registry.article_index.delete(matches, compact=True)
+        if deleted and registry.events.subscribers:
+            registry.events.publish([Event('deleted', article, None, None, None)
+                                     for article in matches if article.deleted])
+        return deleted
+
+    @classmethod
+    def compact(cls):
+        Registry.current().article_index.compact()
+
+    # --- Bulk Loading ---
+
+    @classmethod
+    def bulk_create(cls, rows):
+        # Validates every (author, magazine, title) row up front and either
+        # creates them all or raises a BulkCreateError listing each bad row.
+        registry = Registry.current()
+        articles = []
+        errors = []
+        for index, row in enumerate(rows):
+            try:
+                author, magazine, title = row
+            except (TypeError, ValueError):
+                errors.append((index, "Row must be an (author, magazine, title) triple"))
+                continue
+
+            if not isinstance(author, Author):
+                errors.append((index, "Author must be an instance of Author"))
+            elif not isinstance(magazine, Magazine):
+                errors.append((index, "Magazine must be an instance of Magazine"))
+            elif not isinstance(title, str):
+                errors.append((index, "Title must be a string"))
+            elif not 5 <= len(title) <= 50:
+                errors.append((index, "Title must be between 5 and 50 characters, inclusive"))
+            elif author._registry is not registry or magazine._registry is not registry:
+                errors.append((index, "Author and magazine must belong to the current registry"))
+            elif not errors:
+                # Fields are already validated, so skip the setters
+                article = cls.__new__(cls)
+                article._author = author
+                article._magazine = magazine
+                article._title = title
+                article._seq = next(Article._sequence)
+                articles.append(article)
+
+        if errors:
+            raise BulkCreateError(errors)
+
+        # One extend; the index picks the whole batch up on its next read
+        registry.articles.extend(articles)
+        if articles and registry.events.subscribers:
+            registry.events.publish([Event('created', article, None, None, None)
+                                     for article in articles])
+        return articles
+
+class Author(metaclass=Registered):
+    __slots__ = ('_name', '_registry')
+
+    _registry_field = 'authors'
 
-class Author:
     def __init__(self, name):
         self.name = name
+        self._registry = Registry.current()
+        self._registry.authors.append(self)
 
     # --- Properties ---
 
@@ -79,11 +240,23 @@ class Author:
 
     @property
     def articles(self):
-        return [article for article in Article.all if article.author is self]
+        return self._registry.article_index.articles_by_author(self)
 
     @property
     def magazines(self):
-        return list(set(article.magazine for article in self.articles))
+        return self._registry.article_index.magazines_of(self)
+
+    def iter_articles(self):
+        return self._registry.article_index.iter_by('by_author', self)
+
+    def iter_magazines(self):
+        return self._registry.article_index.iter_by('magazines_by_author', self)
+
+    def has_articles(self):
+        return self._registry.article_index.has('by_author', self)
+
+    def articles_page(self, after=None, limit=50, order="insertion"):
+        return self._registry.article_index.page('by_author', self, after, limit, order)
 
     # --- Aggregate and Association Methods ---
 
@@ -92,18 +265,65 @@ class Author:
             raise Exception("Magazine must be an instance of Magazine")
         return Article(self, magazine, title)
 
+    def add_articles(self, entries):
+        # entries is an iterable of (magazine, title) pairs
+        rows = []
+        for entry in entries:
+            try:
+                magazine, title = entry
+            except (TypeError, ValueError):
+                # Keeps its position so bulk_create reports it as a bad row
+                rows.append(None)
+            else:
+                rows.append((self, magazine, title))
+        return Article.bulk_create(rows)
+
+    # --- Lookup ---
+
+    @classmethod
+    def find_by_name(cls, name):
+        return Registry.current().author_names.first(name)
+
+    @classmethod
+    def find_or_create(cls, name):
+        names = Registry.current().author_names
+        # Held across the lookup and the create so racing loaders can't both create
+        with names.lock:
+            author = names.first(name)
+            return author if author is not None else cls(name)
+
     def topic_areas(self):
-        if not self.articles:
-            return None
-        return list(set(magazine.category for magazine in self.magazines))
+        categories = self._registry.article_index.categories_of(self)
+        return categories if categories else None
+
+    @classmethod
+    def topic_areas_all(cls):
+        # {author: topic_areas()} for every author in Author.all
+        registry = Registry.current()
+        return registry.article_index.categories_of_all(registry.authors)
 
-class Magazine:
-    all = []
+    @classmethod
+    def most_prolific(cls, n, since=None):
+        # Authors with the most articles, optionally only counting articles
+        # whose seq is `since` or later
+        index = Registry.current().article_index
+        authors = index.top_authors(n) if since is None else index.top_since('author', n, since)
+        return authors if authors else None
+
+    async def atopic_areas(self):
+        # topic_areas() off the event loop, on the registry's aio.Catalog
+        return await _catalog(self._registry).topic_areas(self)
+
+class Magazine(metaclass=Registered):
+    __slots__ = ('_name', '_category', '_registry')
+
+    _registry_field = 'magazines'
 
     def __init__(self, name, category):
+        self._registry = Registry.current()
         self.name = name
         self.category = category
-        Magazine.all.append(self)
+        self._registry.magazines.append(self)
 
     # --- Properties ---
 
@@ -117,7 +337,15 @@ class Magazine:
             raise Exception("Name must be a string")
         if not 2 <= len(value) <= 16:
             raise Exception("Name must be between 2 and 16 characters, inclusive")
-        self._name = value
+        names = self._registry.magazine_names
+        with names.lock:
+            names.sync()
+            old = getattr(self, '_name', None)
+            self._name = value
+            names.changed(self, old)
+        # Only reassignments are events; the first assignment is part of __init__
+        if old is not None and self._registry.events.subscribers:
+            self._registry.events.publish([Event('changed', self, 'name', old, value)])
 
     @property
     def category(self):
@@ -129,47 +357,96 @@ class Magazine:
             raise Exception("Category must be a string")
         if not len(value) > 0:
             raise Exception("Category must be longer than 0 characters")
-        self._category = value
+        index = self._registry.article_index
+        categories = self._registry.magazine_categories
+        # Lock order: article index first, then the category index
+        with index.lock, categories.lock:
+            index.sync()
+            categories.sync()
+            old = getattr(self, '_category', None)
+            self._category = value
+            index.category_changed(self, old)
+            categories.changed(self, old)
+        if old is not None and self._registry.events.subscribers:
+            self._registry.events.publish([Event('changed', self, 'category', old, value)])
 
     # --- Relationship Properties (for 76% and 80% tests) ---
 
     @property
     def articles(self):
-        return [article for article in Article.all if article.magazine is self]
+        return self._registry.article_index.articles_by_magazine(self)
 
     @property
     def contributors(self):
-        return list(set(article.author for article in self.articles))
+        return self._registry.article_index.contributors_of(self)
 
-    # --- Aggregate and Association Methods ---
+    def iter_articles(self):
+        return self._registry.article_index.iter_by('by_magazine', self)
+
+    def iter_contributors(self):
+        return self._registry.article_index.iter_by('authors_by_magazine', self)
 
-    def article_titles(self):
-        articles = self.articles
-        return [article.title for article in articles] if articles else None
+    def has_articles(self):
+        return self._registry.article_index.has('by_magazine', self)
 
-    def contributing_authors(self):
-        articles = self.articles
-        if not articles:
-            return None
+    def articles_page(self, after=None, limit=50, order="insertion"):
+        return self._registry.article_index.page('by_magazine', self, after, limit, order)
 
-        author_counts = {}
-        for article in articles:
-            author = article.author
-            author_counts[author] = author_counts.get(author, 0) + 1
+    # --- Lookup ---
 
-        contributing = [author for author, count in author_counts.items() if count > 2]
+    @classmethod
+    def find_by_name(cls, name):
+        return Registry.current().magazine_names.first(name)
+
+    @classmethod
+    def find_or_create(cls, name, category):
+        names = Registry.current().magazine_names
+        with names.lock:
+            magazine = names.first(name)
+            return magazine if magazine is not None else cls(name, category)
+
+    @classmethod
+    def by_category(cls, category):
+        return Registry.current().magazine_categories.all(category)
+
+    # --- Aggregate and Association Methods ---
 
+    def article_titles(self, order="insertion"):
+        titles = self._registry.article_index.titles_of(self, order)
+        return titles if titles else None
+
+    def contributing_authors(self, threshold=2):
+        # Authors with more than `threshold` articles in this magazine
+        contributing = self._registry.article_index.authors_above(self, threshold)
         return contributing if contributing else None
 
+    async def acontributing_authors(self, threshold=2):
+        return await _catalog(self._registry).contributing_authors(self, threshold)
+
     @classmethod
-    def top_publisher(cls):
-        if not Article.all:
-            return None
+    def contributing_authors_all(cls, threshold=2):
+        # {magazine: contributing_authors(threshold)} for every magazine in Magazine.all
+        registry = Registry.current()
+        return registry.article_index.authors_above_all(registry.magazines, threshold)
 
-        magazine_counts = {}
-        for article in Article.all:
-            magazine = article.magazine
-            magazine_counts[magazine] = magazine_counts.get(magazine, 0) + 1
+    def contributions(self, author):
+        return self._registry.article_index.contributions(self, author)
 
-        # Returns the actual Magazine object with the highest count.
-        return max(magazine_counts, key=magazine_counts.get)
\ No newline at end of file
+    @classmethod
+    def top_publisher(cls):
+        # Ties go to the magazine that reached the leading count first
+        return Registry.current().article_index.top_magazine()
+
+    @classmethod
+    def top_publishers(cls, n, since=None):
+        # With `since`, only articles whose seq is `since` or later count
+        index = Registry.current().article_index
+        magazines = (index.top_magazines(n) if since is None
+                     else index.top_since('magazine', n, since))
+        return magazines if magazines else None
+
+
+def _catalog(registry):
+    # aio imports this module, so it is only imported on first use
+    from .aio import Catalog
+    return Catalog.of(registry)
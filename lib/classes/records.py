@@ -0,0 +1,135 @@
+"""Streaming import and export of articles as CSV or JSON-lines records.
+
+Each record carries the author name, magazine name, magazine category and
+article title:
+
+    author,magazine,category,title
+    Carrie Bradshaw,Vogue,Fashion,The Dress Dilemma
+
+Both directions work one record at a time, so memory use does not grow
+with the size of the file.
+"""
+import csv
+import json
+import os
+
+from .many_to_many import Article, Author, BulkCreateError, Magazine
+
+FIELDS = ("author", "magazine", "category", "title")
+
+
+def _format_of(path, format):
+    if format is not None:
+        return format
+    extension = os.path.splitext(str(path))[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise Exception(f"Cannot tell the record format of {path}; pass format='csv' or 'jsonl'")
+
+
+def read_records(source, format):
+    if format == "csv":
+        yield from csv.DictReader(source)
+    elif format == "jsonl":
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        raise Exception(f"Unknown record format {format!r}")
+
+
+def _check_record(record):
+    # The same checks, with the same messages, as the Author, Magazine
+    # and Article setters
+    missing = [field for field in FIELDS if field not in record]
+    if missing:
+        return f"Record is missing {', '.join(missing)}"
+    author, magazine, category, title = (record[field] for field in FIELDS)
+    if not isinstance(author, str):
+        return "Name must be a string"
+    if not len(author) > 0:
+        return "Name must be longer than 0 characters"
+    if not isinstance(magazine, str):
+        return "Name must be a string"
+    if not 2 <= len(magazine) <= 16:
+        return "Name must be between 2 and 16 characters, inclusive"
+    if not isinstance(category, str):
+        return "Category must be a string"
+    if not len(category) > 0:
+        return "Category must be longer than 0 characters"
+    if not isinstance(title, str):
+        return "Title must be a string"
+    if not 5 <= len(title) <= 50:
+        return "Title must be between 5 and 50 characters, inclusive"
+    return None
+
+
+def _import_batch(batch, start):
+    # Every record is checked before any author or magazine is created, so
+    # a bad record doesn't leave entities behind for the rows before it
+    errors = [(start + offset, message) for offset, message in
+              enumerate(map(_check_record, batch)) if message is not None]
+    if errors:
+        raise BulkCreateError(errors)
+
+    rows = [(Author.find_or_create(record["author"]),
+             Magazine.find_or_create(record["magazine"], record["category"]),
+             record["title"]) for record in batch]
+
+    try:
+        return len(Article.bulk_create(rows))
+    except BulkCreateError as error:
+        # Report positions in the file rather than in the batch
+        raise BulkCreateError([(start + index, message) for index, message in error.errors])
+
+
+def import_articles(path, format=None, batch_size=10_000):
+    # Batches are validated and stored one at a time; a bad record stops the
+    # import with every earlier batch already loaded
+    format = _format_of(path, format)
+    imported = 0
+    batch = []
+    with open(path, newline="", encoding="utf-8") as source:
+        for record in read_records(source, format):
+            batch.append(record)
+            if len(batch) == batch_size:
+                imported += _import_batch(batch, imported)
+                batch = []
+        if batch:
+            imported += _import_batch(batch, imported)
+    return imported
+
+
+def iter_records(articles=None):
+    for article in Article.all if articles is None else articles:
+        if article.deleted:
+            continue
+        magazine = article.magazine
+        yield {
+            "author": article.author.name,
+            "magazine": magazine.name,
+            "category": magazine.category,
+            "title": article.title,
+        }
+
+
+def export_articles(path, format=None, articles=None):
+    format = _format_of(path, format)
+    exported = 0
+    with open(path, "w", newline="", encoding="utf-8") as output:
+        if format == "csv":
+            writer = csv.DictWriter(output, fieldnames=FIELDS)
+            writer.writeheader()
+            for record in iter_records(articles):
+                writer.writerow(record)
+                exported += 1
+        elif format == "jsonl":
+            for record in iter_records(articles):
+                output.write(json.dumps(record, ensure_ascii=False))
+                output.write("\n")
+                exported += 1
+        else:
+            raise Exception(f"Unknown record format {format!r}")
+    return exported
@@ -0,0 +1,91 @@
+"""Registries that own one catalog's articles, authors, magazines and indexes.
+
+Everything used to hang off class attributes, so a process could only hold
+one catalog. A ``Registry`` holds what ``Article.all``, ``Author.all`` and
+``Magazine.all`` point at. Those class attributes resolve against the
+registry that is current in the running context:
+
+    with Registry() as tenant:
+        Magazine("Vogue", "Fashion")   # lands in tenant.magazines
+        Magazine.top_publisher()       # answered from tenant's indexes
+
+Outside any ``with`` block the default registry is current, which behaves
+exactly like the old class-level lists. The current registry is a context
+variable, so threads and asyncio tasks each see their own. Authors and
+magazines remember the registry they were created in, and articles belong
+to their author's. Dropping a tenant is just dropping its registry.
+"""
+from contextvars import ContextVar
+
+from .events import EventBus
+from .indexes import ArticleIndex, AttributeIndex, TrackedList
+from .store import Store
+
+
+class Registry:
+    def __init__(self):
+        self._article_index = ArticleIndex(lambda: self._articles)
+        self.articles = TrackedList()
+        self.authors = TrackedList()
+        self.magazines = TrackedList()
+        self.author_names = AttributeIndex(lambda: self.authors, 'name')
+        self.magazine_names = AttributeIndex(lambda: self.magazines, 'name')
+        self.magazine_categories = AttributeIndex(lambda: self.magazines, 'category')
+        self.events = EventBus()
+        # The aio.Catalog behind Author.atopic_areas, created on first use
+        self.catalog = None
+
+    @property
+    def articles(self):
+        return self._articles
+
+    @articles.setter
+    def articles(self, value):
+        self._articles = value
+        # A store that answers the catalog queries itself (SQLiteStore)
+        # stands in for the in-memory index. The index lets go of what it
+        # indexed before, so the old articles aren't kept alive by it.
+        self._store_index = value.article_index if isinstance(value, Store) else None
+        if self._store_index is not None:
+            self._article_index.forget()
+
+    @property
+    def article_index(self):
+        if self._store_index is not None:
+            return self._store_index
+        return self._article_index
+
+    @classmethod
+    def current(cls):
+        return _current.get()
+
+    def __enter__(self):
+        # Tokens are kept per context, so one registry can be entered by
+        # several threads or tasks at once
+        _tokens.set(_tokens.get() + (_current.set(self),))
+        return self
+
+    def __exit__(self, *exc_info):
+        tokens = _tokens.get()
+        _tokens.set(tokens[:-1])
+        _current.reset(tokens[-1])
+
+
+DEFAULT = Registry()
+_current = ContextVar('registry', default=DEFAULT)
+_tokens = ContextVar('registry_tokens', default=())
+
+
+class Registered(type):
+    # `Article.all` and friends read and assign the current registry's list
+    @property
+    def all(cls):
+        return getattr(_current.get(), cls._registry_field)
+
+    @all.setter
+    def all(cls, value):
+        # A plain list is copied into a TrackedList, so the indexes notice
+        # when it is later cleared and refilled in place
+        if type(value) is list:
+            value = TrackedList(value)
+        setattr(_current.get(), cls._registry_field, value)
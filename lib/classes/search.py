@@ -0,0 +1,130 @@
+"""Inverted index over article titles.
+
+Titles are write-once, so every title is tokenized a single time when the
+article index picks the article up. Articles picked up in bulk (a cold
+build or a snapshot load) are tokenized on the first search instead, so
+the other queries don't wait on them. Lookups then only touch the words
+in the query:
+
+* words map to the articles whose titles contain them,
+* a lazily sorted word list answers prefix matches by bisection,
+* padded trigrams map back to words for typo-tolerant (fuzzy) matches.
+"""
+import re
+from bisect import bisect_left
+from collections import Counter
+
+WORD = re.compile(r"\w+")
+
+# Share of trigrams two words need in common to count as a fuzzy match
+FUZZY_SIMILARITY = 0.4
+
+
+def tokenize(text):
+    return WORD.findall(text.lower())
+
+
+def trigrams(word):
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    def __init__(self):
+        self.postings = {}
+        self._trigrams = {}
+        self._sorted_words = []
+        self._unsorted = False
+        # Articles added in bulk and not tokenized yet
+        self._pending = {}
+
+    def add(self, article):
+        for word in tokenize(article.title):
+            articles = self.postings.get(word)
+            if articles is None:
+                articles = self.postings[word] = {}
+                for trigram in trigrams(word):
+                    self._trigrams.setdefault(trigram, {})[word] = None
+                self._unsorted = True
+            articles[article] = None
+
+    def add_many(self, articles):
+        self._pending.update(dict.fromkeys(articles))
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        for article in pending:
+            self.add(article)
+
+    def remove(self, article):
+        if article in self._pending:
+            del self._pending[article]
+            return
+        for word in tokenize(article.title):
+            articles = self.postings.get(word)
+            if articles is None or article not in articles:
+                continue
+            del articles[article]
+            if not articles:
+                del self.postings[word]
+                for trigram in trigrams(word):
+                    words = self._trigrams[trigram]
+                    del words[word]
+                    if not words:
+                        del self._trigrams[trigram]
+                self._unsorted = True
+
+    # --- Word Matching ---
+
+    def _prefixed(self, prefix):
+        if self._unsorted:
+            self._sorted_words = sorted(self.postings)
+            self._unsorted = False
+        words = self._sorted_words
+        position = bisect_left(words, prefix)
+        while position < len(words) and words[position].startswith(prefix):
+            yield words[position]
+            position += 1
+
+    def _similar(self, word):
+        wanted = trigrams(word)
+        shared = Counter()
+        for trigram in wanted:
+            shared.update(iter(self._trigrams.get(trigram, ())))
+        for candidate, common in shared.items():
+            if common / (len(wanted) + len(trigrams(candidate)) - common) >= FUZZY_SIMILARITY:
+                yield candidate
+
+    def matches(self, word, prefix, fuzzy):
+        words = {word} if word in self.postings else set()
+        if prefix:
+            words.update(self._prefixed(word))
+        if fuzzy:
+            words.update(self._similar(word))
+        return words
+
+    # --- Queries ---
+
+    def search(self, query, within=(), prefix=True, fuzzy=False):
+        # Articles matching every word of the query, in insertion order.
+        # Each collection in `within` narrows the candidates further.
+        words = tokenize(query)
+        if not words:
+            return []
+        self._flush()
+
+        hits = None
+        for candidates in sorted(within, key=len):
+            hits = set(candidates) if hits is None else hits.intersection(candidates)
+
+        for word in words:
+            postings = [self.postings[match] for match in self.matches(word, prefix, fuzzy)]
+            if hits is not None and len(hits) < sum(map(len, postings)):
+                # Fewer candidates than postings: probe instead of building the union
+                hits = {article for article in hits if any(article in found for found in postings)}
+            else:
+                found = set().union(*postings)
+                hits = found if hits is None else hits & found
+            if not hits:
+                return []
+        return sorted(hits, key=lambda article: article._seq)
@@ -0,0 +1,664 @@
+"""SQLite backend for ``Article.all``.
+
+``SQLiteStore`` is a drop-in sequence for the plain list, like
+``ArticleStore``, that keeps the articles in a SQLite database instead of
+in memory:
+
+    Article.all = SQLiteStore(Article.all, path="catalog.db")
+    ...
+    SQLiteStore.open("catalog.db")   # later, in a fresh process
+
+Authors, magazines and articles get one table each, with articles indexed
+on author_id and (magazine_id, author_id) and magazines on category. A
+title_words table is the inverted index behind ``Article.search``. An
+article's row id is its sequence number, so insertion order, cursors and
+``since`` windows are all ranges over the primary key.
+
+While the store is ``Article.all``, a ``SQLiteIndex`` stands in for the
+in-memory ``ArticleIndex``. ``Author.articles``, ``Magazine.contributors``,
+``contributing_authors``, ``top_publisher`` and the rest of the catalog
+queries then run as SQL (GROUP BY/HAVING) against those indexes. Article
+objects are built from the rows a query returns and are only held
+weakly, so memory goes with what callers keep, not with the catalog.
+Authors and magazines stay resident. Every entry of ``Author.all`` and
+``Magazine.all`` is stored, with or without articles, by the next
+flush, query or close.
+
+Answers match the in-memory index, except that contributors, magazines
+and topic areas are listed in order of their oldest live article. The
+index lists them in the order they first appeared, which deletes and
+recategorisations don't change.
+
+Writes are queued and applied in one transaction per ``batch_size`` rows
+on a single reused connection. Queries and ``flush()`` apply whatever is
+still queued first; ``close()`` flushes and disconnects. Deletes remove
+the row right away, so the store never holds tombstones to compact.
+"""
+import sqlite3
+import threading
+import weakref
+from itertools import count
+
+from .indexes import Page, SyncedIndex, check_limit, check_n, check_order
+from .many_to_many import Article, Author, Magazine
+from .registry import Registry
+from .search import FUZZY_SIMILARITY, tokenize, trigrams
+from .store import Store
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS authors (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS magazines (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    author_id INTEGER NOT NULL REFERENCES authors (id),
+    magazine_id INTEGER NOT NULL REFERENCES magazines (id),
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS title_words (
+    word TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    PRIMARY KEY (word, article_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS articles_by_author ON articles (author_id);
+CREATE INDEX IF NOT EXISTS articles_by_magazine ON articles (magazine_id, author_id);
+CREATE INDEX IF NOT EXISTS magazines_by_category ON magazines (category);
+CREATE INDEX IF NOT EXISTS title_words_by_article ON title_words (article_id);
+"""
+
+INSERT_AUTHOR = "INSERT INTO authors (id, name) VALUES (?, ?)"
+INSERT_MAGAZINE = "INSERT INTO magazines (id, name, category) VALUES (?, ?, ?)"
+UPDATE_MAGAZINE = "UPDATE magazines SET name = ?, category = ? WHERE id = ?"
+INSERT_ARTICLE = "INSERT INTO articles (id, author_id, magazine_id, title) VALUES (?, ?, ?, ?)"
+UPDATE_ARTICLE = "UPDATE articles SET author_id = ?, magazine_id = ? WHERE id = ?"
+DELETE_ARTICLE = "DELETE FROM articles WHERE id = ?"
+INSERT_WORD = "INSERT OR IGNORE INTO title_words (word, article_id) VALUES (?, ?)"
+DELETE_WORDS = "DELETE FROM title_words WHERE article_id = ?"
+
+SELECT_ARTICLES = "SELECT id, author_id, magazine_id, title FROM articles "
+
+# Upper bound for a prefix range over the words
+LAST_CHARACTER = "\U0010ffff"
+
+
+class SQLiteStore(Store):
+    # Rows fetched per query while iterating
+    PAGE = 1000
+
+    def __init__(self, articles=(), path=":memory:", batch_size=1000):
+        self._connect(path, batch_size)
+        (existing,) = self._connection.execute("SELECT COUNT(*) FROM authors").fetchone()
+        if existing:
+            self._connection.close()
+            raise Exception(f"{path} already holds a catalog; load it with SQLiteStore.open")
+        self._subscribe()
+        self.extend(articles)
+
+    def _connect(self, path, batch_size):
+        self.path = path
+        self.batch_size = batch_size
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._pending = []
+        self._reset()
+        self.article_index = SQLiteIndex(self)
+
+    def _subscribe(self):
+        # Renamed magazines are picked up from the change events until the
+        # store is closed
+        registry = Registry.current()
+        self._events = registry.events
+        self._events.subscribe(self._magazines_changed)
+        self._entities = (_Entities(lambda: registry.authors, self.author_id),
+                          _Entities(lambda: registry.magazines, self.magazine_id))
+
+    @classmethod
+    def open(cls, path, batch_size=1000):
+        # Loads the authors and magazines stored at path into the current
+        # registry and makes the store Article.all. Articles stay on disk.
+        store = cls.__new__(cls)
+        store._connect(path, batch_size)
+        registry = Registry.current()
+        query = store._connection.execute
+        for author_id, name in query("SELECT id, name FROM authors ORDER BY id"):
+            author = Author.__new__(Author)
+            author._name = name
+            author._registry = registry
+            store._author_ids[author] = author_id
+            store.authors[author_id] = author
+        for magazine_id, name, category in query(
+                "SELECT id, name, category FROM magazines ORDER BY id"):
+            magazine = Magazine.__new__(Magazine)
+            magazine._name = name
+            magazine._category = category
+            magazine._registry = registry
+            store._magazine_ids[magazine] = magazine_id
+            store.magazines[magazine_id] = magazine
+        store._size, last = query("SELECT COUNT(*), MAX(id) FROM articles").fetchone()
+        # Row ids are sequence numbers, so new articles have to number after them
+        if last is not None:
+            Article._sequence = count(max(next(Article._sequence), last + 1))
+        store._subscribe()
+        # Fresh lists, so the name and category indexes rebuild on next read
+        Author.all = list(store.authors.values())
+        Magazine.all = list(store.magazines.values())
+        Article.all = store
+        return store
+
+    def _reset(self):
+        # Row id -> the Article object for it, while anything still holds one
+        self._by_id = weakref.WeakValueDictionary()
+        self._size = 0
+        self.authors = {}
+        self.magazines = {}
+        self._author_ids = {}
+        self._magazine_ids = {}
+
+    # --- Writes ---
+
+    def _queue(self, statement, params):
+        self._pending.append((statement, params))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._store_entities()
+            self._flush()
+
+    def _store_entities(self):
+        # Queues rows for authors and magazines created since the last call
+        for entities in self._entities:
+            entities.sync()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        # One transaction, with runs of the same statement sent as executemany
+        with self._connection:
+            start = 0
+            for end in range(1, len(pending) + 1):
+                if end == len(pending) or pending[end][0] != pending[start][0]:
+                    self._connection.executemany(
+                        pending[start][0], [params for _, params in pending[start:end]])
+                    start = end
+
+    def close(self):
+        with self._lock:
+            if self._events is None:
+                return
+            self._store_entities()
+            self._flush()
+            self._events.unsubscribe(self._magazines_changed)
+            self._events = None
+            self._connection.close()
+
+    def author_id(self, author):
+        author_id = self._author_ids.get(author)
+        if author_id is None:
+            author_id = self._author_ids[author] = len(self._author_ids)
+            self.authors[author_id] = author
+            self._queue(INSERT_AUTHOR, (author_id, author.name))
+        return author_id
+
+    def magazine_id(self, magazine):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            magazine_id = self._magazine_ids[magazine] = len(self._magazine_ids)
+            self.magazines[magazine_id] = magazine
+            self._queue(INSERT_MAGAZINE, (magazine_id, magazine.name, magazine.category))
+        return magazine_id
+
+    def magazine_changed(self, magazine):
+        with self._lock:
+            magazine_id = self._magazine_ids.get(magazine)
+            if magazine_id is not None:
+                self._queue(UPDATE_MAGAZINE, (magazine.name, magazine.category, magazine_id))
+
+    def _magazines_changed(self, events):
+        # Categories come through SQLiteIndex.category_changed instead, which
+        # runs before the setter returns
+        for event in events:
+            if (event.kind == 'changed' and event.field == 'name'
+                    and isinstance(event.target, Magazine)):
+                self.magazine_changed(event.target)
+
+    # --- Rows ---
+
+    def _article(self, row):
+        # One object per row for as long as anything holds on to it
+        article_id, author_id, magazine_id, title = row
+        article = self._by_id.get(article_id)
+        if article is None:
+            article = Article.__new__(Article)
+            article._author = self.authors[author_id]
+            article._magazine = self.magazines[magazine_id]
+            article._title = title
+            article._seq = article_id
+            self._by_id[article_id] = article
+        return article
+
+    def select(self, where, params=()):
+        # Articles for SELECT_ARTICLES + where, e.g. "WHERE author_id = ? ORDER BY id"
+        with self._lock:
+            return [self._article(row) for row in self._query(SELECT_ARTICLES + where, params)]
+
+    def _delete(self, article):
+        if article not in self:
+            return False
+        self._queue(DELETE_ARTICLE, (article._seq,))
+        self._queue(DELETE_WORDS, (article._seq,))
+        del self._by_id[article._seq]
+        self._size -= 1
+        article._seq = None
+        return True
+
+    # --- Sequence Protocol ---
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        # Positions are counted along the ids, so this is an OFFSET scan
+        if isinstance(index, slice):
+            positions = range(*index.indices(self._size))
+            if not positions:
+                return []
+            low = min(positions)
+            rows = self.select("ORDER BY id LIMIT ? OFFSET ?", (max(positions) - low + 1, low))
+            return [rows[position - low] for position in positions]
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("SQLiteStore index out of range")
+        return self.select("ORDER BY id LIMIT 1 OFFSET ?", (index,))[0]
+
+    def __iter__(self):
+        # A page at a time by id, so no cursor stays open across writes
+        last = -1
+        while True:
+            with self._lock:
+                rows = self._query(SELECT_ARTICLES + "WHERE id > ? ORDER BY id LIMIT ?",
+                                   (last, self.PAGE))
+                page = [self._article(row) for row in rows]
+            if not page:
+                return
+            yield from page
+            last = rows[-1][0]
+
+    def __contains__(self, article):
+        return (isinstance(article, Article) and article._seq is not None
+                and self._by_id.get(article._seq) is article)
+
+    def append(self, article):
+        with self._lock:
+            article_id = article._seq
+            self._by_id[article_id] = article
+            self._size += 1
+            self._queue(INSERT_ARTICLE, (article_id, self.author_id(article.author),
+                                         self.magazine_id(article.magazine), article.title))
+            for word in dict.fromkeys(tokenize(article.title)):
+                self._queue(INSERT_WORD, (word, article_id))
+
+    def extend(self, articles):
+        with self._lock:
+            for article in articles:
+                # Deleted articles have no sequence number to key a row on
+                if article._seq is not None:
+                    self.append(article)
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+            with self._connection:
+                for table in ("title_words", "articles", "magazines", "authors"):
+                    self._connection.execute(f"DELETE FROM {table}")
+            self._reset()
+
+    def __delitem__(self, index):
+        articles = self[index] if isinstance(index, slice) else [self[index]]
+        self.article_index.delete(articles)
+
+    # Rows are ordered by sequence number, so there is no placing an
+    # article anywhere but the end
+    def __setitem__(self, index, value):
+        raise Exception("SQLiteStore only supports appending and deleting articles")
+
+    def insert(self, index, article):
+        raise Exception("SQLiteStore only supports appending and deleting articles")
+
+    def __repr__(self):
+        return f"SQLiteStore({self.path!r}, {self._size} articles)"
+
+    # --- Write Hooks ---
+
+    def row_changed(self, article):
+        with self._lock:
+            if article in self:
+                self._queue(UPDATE_ARTICLE, (self.author_id(article.author),
+                                             self.magazine_id(article.magazine), article._seq))
+
+    # --- SQL Aggregates ---
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            self._store_entities()
+            self._flush()
+            return self._connection.execute(sql, params).fetchall()
+
+    def articles_of(self, author):
+        author_id = self._author_ids.get(author)
+        if author_id is None:
+            return []
+        return self.select("WHERE author_id = ? ORDER BY id", (author_id,))
+
+    def articles_in(self, magazine):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return []
+        return self.select("WHERE magazine_id = ? ORDER BY id", (magazine_id,))
+
+    def contributors_of(self, magazine):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return []
+        rows = self._query("SELECT author_id FROM articles WHERE magazine_id = ? "
+                           "GROUP BY author_id ORDER BY MIN(id)", (magazine_id,))
+        return [self.authors[author_id] for author_id, in rows]
+
+    def magazines_of(self, author):
+        author_id = self._author_ids.get(author)
+        if author_id is None:
+            return []
+        rows = self._query("SELECT magazine_id FROM articles WHERE author_id = ? "
+                           "GROUP BY magazine_id ORDER BY MIN(id)", (author_id,))
+        return [self.magazines[magazine_id] for magazine_id, in rows]
+
+    def by_category(self, category):
+        rows = self._query("SELECT id FROM magazines WHERE category = ? ORDER BY id", (category,))
+        return [self.magazines[magazine_id] for magazine_id, in rows]
+
+    def magazine_counts(self):
+        rows = self._query("SELECT magazine_id, COUNT(*) FROM articles "
+                           "GROUP BY magazine_id ORDER BY magazine_id")
+        return {self.magazines[magazine_id]: count for magazine_id, count in rows}
+
+    def author_counts(self, magazine):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return {}
+        rows = self._query("SELECT author_id, COUNT(*) FROM articles WHERE magazine_id = ? "
+                           "GROUP BY author_id ORDER BY author_id", (magazine_id,))
+        return {self.authors[author_id]: count for author_id, count in rows}
+
+    def top_publishers(self, n):
+        # Ties go to the magazine that reached the count first: the one
+        # whose latest article is oldest
+        rows = self._query("SELECT magazine_id FROM articles GROUP BY magazine_id "
+                           "ORDER BY COUNT(*) DESC, MAX(id) LIMIT ?", (n,))
+        return [self.magazines[magazine_id] for magazine_id, in rows]
+
+    def top_publisher(self):
+        top = self.top_publishers(1)
+        return top[0] if top else None
+
+    def contributing_authors(self, magazine, threshold=2):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return None
+        rows = self._query("SELECT author_id FROM articles WHERE magazine_id = ? "
+                           "GROUP BY author_id HAVING COUNT(*) > ? ORDER BY MIN(id)",
+                           (magazine_id, threshold))
+        contributing = [self.authors[author_id] for author_id, in rows]
+        return contributing if contributing else None
+
+
+class _Entities(SyncedIndex):
+    # Follows Author.all or Magazine.all and hands each new entry to the
+    # store, so authors and magazines without articles are stored too
+
+    def __init__(self, source, store):
+        self._store = store
+        super().__init__(source)
+
+    def reset(self):
+        # Storing an entity twice is a no-op, so a rebuild has nothing to drop
+        pass
+
+    def add(self, entity):
+        self._store(entity)
+
+
+class SQLiteIndex:
+    """Answers the catalog queries from a SQLiteStore's tables.
+
+    It has the interface of ``ArticleIndex`` and stands in for it while
+    the store is ``Article.all``. Nothing is cached: each lookup is a
+    query, so there is nothing to catch up on or invalidate.
+    """
+
+    # ArticleIndex mapping names -> (store method, filter column)
+    MAPPINGS = {
+        'by_author': ('articles_of', 'author_id'),
+        'by_magazine': ('articles_in', 'magazine_id'),
+        'magazines_by_author': ('magazines_of', 'author_id'),
+        'authors_by_magazine': ('contributors_of', 'magazine_id'),
+    }
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = store._lock
+
+    def sync(self):
+        # Every write reaches the tables through the store
+        pass
+
+    def _entity_id(self, column, entity):
+        ids = self.store._author_ids if column == 'author_id' else self.store._magazine_ids
+        return ids.get(entity)
+
+    # --- Write Hooks ---
+
+    def author_changed(self, article, old):
+        # The row itself is rewritten by SQLiteStore.row_changed
+        pass
+
+    def magazine_changed(self, article, old):
+        pass
+
+    def category_changed(self, magazine, old):
+        if magazine.category != old:
+            self.store.magazine_changed(magazine)
+
+    def delete(self, articles, compact=False):
+        # Rows leave the tables right away; there is nothing to compact
+        with self.lock:
+            return sum(self.store._delete(article) for article in articles)
+
+    def compact(self):
+        pass
+
+    def cache_info(self):
+        return {'hits': 0, 'misses': 0, 'entries': 0}
+
+    # --- Lookups ---
+
+    def articles_by_author(self, author):
+        return self.store.articles_of(author)
+
+    def articles_by_magazine(self, magazine):
+        return self.store.articles_in(magazine)
+
+    def magazines_of(self, author):
+        return self.store.magazines_of(author)
+
+    def contributors_of(self, magazine):
+        return self.store.contributors_of(magazine)
+
+    def iter_by(self, mapping, entity):
+        return iter(getattr(self.store, self.MAPPINGS[mapping][0])(entity))
+
+    def has(self, mapping, entity):
+        column = self.MAPPINGS[mapping][1]
+        entity_id = self._entity_id(column, entity)
+        if entity_id is None:
+            return False
+        (found,) = self.store._query(
+            f"SELECT EXISTS (SELECT 1 FROM articles WHERE {column} = ?)", (entity_id,))[0]
+        return bool(found)
+
+    def titles_of(self, magazine, order):
+        check_order(order)
+        magazine_id = self.store._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return []
+        sort = "id" if order == 'insertion' else "title, id"
+        rows = self.store._query(f"SELECT title FROM articles WHERE magazine_id = ? "
+                                 f"ORDER BY {sort}", (magazine_id,))
+        return [title for title, in rows]
+
+    def page(self, mapping, entity, after, limit, order):
+        check_limit(limit)
+        check_order(order)
+        column = self.MAPPINGS[mapping][1]
+        entity_id = self._entity_id(column, entity)
+        if entity_id is None:
+            return Page([], None)
+        where, params = f"WHERE {column} = ?", [entity_id]
+        if order == 'insertion':
+            if after is not None:
+                where += " AND id > ?"
+                params.append(after)
+            where += " ORDER BY id"
+        else:
+            if after is not None:
+                where += " AND (title, id) > (?, ?)"
+                params.extend(after)
+            where += " ORDER BY title, id"
+        # One row past the page says whether another page follows
+        articles = self.store.select(where + " LIMIT ?", params + [limit + 1])
+        if len(articles) <= limit:
+            return Page(articles, None)
+        last = articles[limit - 1]
+        cursor = last._seq if order == 'insertion' else (last._title, last._seq)
+        return Page(articles[:limit], cursor)
+
+    def categories_of(self, author):
+        author_id = self.store._author_ids.get(author)
+        if author_id is None:
+            return []
+        rows = self.store._query(
+            "SELECT magazines.category FROM articles "
+            "JOIN magazines ON magazines.id = articles.magazine_id "
+            "WHERE articles.author_id = ? "
+            "GROUP BY magazines.category ORDER BY MIN(articles.id)", (author_id,))
+        return [category for category, in rows]
+
+    def categories_of_all(self, authors):
+        rows = self.store._query(
+            "SELECT articles.author_id, magazines.category FROM articles "
+            "JOIN magazines ON magazines.id = articles.magazine_id "
+            "GROUP BY articles.author_id, magazines.category "
+            "ORDER BY articles.author_id, MIN(articles.id)")
+        categories = {}
+        for author_id, category in rows:
+            categories.setdefault(self.store.authors[author_id], []).append(category)
+        return {author: categories.get(author) for author in authors}
+
+    def contributions(self, magazine, author):
+        magazine_id = self.store._magazine_ids.get(magazine)
+        author_id = self.store._author_ids.get(author)
+        if magazine_id is None or author_id is None:
+            return 0
+        return self.store._query("SELECT COUNT(*) FROM articles "
+                                 "WHERE magazine_id = ? AND author_id = ?",
+                                 (magazine_id, author_id))[0][0]
+
+    def authors_above(self, magazine, threshold):
+        return self.store.contributing_authors(magazine, threshold) or []
+
+    def authors_above_all(self, magazines, threshold):
+        rows = self.store._query("SELECT magazine_id, author_id FROM articles "
+                                 "GROUP BY magazine_id, author_id HAVING COUNT(*) > ? "
+                                 "ORDER BY magazine_id, MIN(id)", (threshold,))
+        results = {}
+        for magazine_id, author_id in rows:
+            results.setdefault(self.store.magazines[magazine_id], []).append(
+                self.store.authors[author_id])
+        return {magazine: results.get(magazine) for magazine in magazines}
+
+    def search(self, query, magazine, author, prefix, fuzzy):
+        # Articles whose titles have every query word, matched through the
+        # title_words table the way TitleIndex matches its postings
+        words = tokenize(query)
+        if not words:
+            return []
+        clauses, params = [], []
+        for column, entity in (('magazine_id', magazine), ('author_id', author)):
+            if entity is not None:
+                entity_id = self._entity_id(column, entity)
+                if entity_id is None:
+                    return []
+                clauses.append(f"{column} = ?")
+                params.append(entity_id)
+        vocabulary = None
+        for word in words:
+            if prefix:
+                matches, match_params = ["word >= ? AND word < ?"], [word, word + LAST_CHARACTER]
+            else:
+                matches, match_params = ["word = ?"], [word]
+            if fuzzy:
+                if vocabulary is None:
+                    vocabulary = [word for word, in self.store._query(
+                        "SELECT DISTINCT word FROM title_words")]
+                similar = _similar(word, vocabulary)
+                if similar:
+                    matches.append(f"word IN ({', '.join('?' * len(similar))})")
+                    match_params.extend(similar)
+            clauses.append("id IN (SELECT article_id FROM title_words WHERE "
+                           + " OR ".join(matches) + ")")
+            params.extend(match_params)
+        return self.store.select("WHERE " + " AND ".join(clauses) + " ORDER BY id", params)
+
+    def top_magazine(self):
+        return self.store.top_publisher()
+
+    def top_magazines(self, n):
+        check_n(n)
+        return self.store.top_publishers(n)
+
+    def top_authors(self, n):
+        check_n(n)
+        rows = self.store._query("SELECT author_id FROM articles GROUP BY author_id "
+                                 "ORDER BY COUNT(*) DESC, MAX(id) LIMIT ?", (n,))
+        return [self.store.authors[author_id] for author_id, in rows]
+
+    def top_since(self, field, n, since):
+        # Ties go to whichever shows up first in the window
+        check_n(n)
+        column = field + '_id'
+        entities = self.store.authors if field == 'author' else self.store.magazines
+        rows = self.store._query(f"SELECT {column} FROM articles WHERE id >= ? "
+                                 f"GROUP BY {column} ORDER BY COUNT(*) DESC, MIN(id) LIMIT ?",
+                                 (since, n))
+        return [entities[entity_id] for entity_id, in rows]
+
+
+def _similar(word, vocabulary):
+    # Words sharing enough trigrams with `word`, as TitleIndex._similar
+    wanted = trigrams(word)
+    similar = []
+    for candidate in vocabulary:
+        found = trigrams(candidate)
+        common = len(wanted & found)
+        if common and common / (len(wanted) + len(found) - common) >= FUZZY_SIMILARITY:
+            similar.append(candidate)
+    return similar
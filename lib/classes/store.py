@@ -0,0 +1,203 @@
+"""Columnar backend for ``Article.all``.
+
+``ArticleStore`` is a drop-in sequence for the plain list:
+
+    Article.all = ArticleStore(Article.all)
+
+Next to the articles it keeps the author and magazine of every row as
+integer ids in ``array`` columns, so catalog-wide aggregates count ids
+in C (``numpy.bincount`` when NumPy is installed, ``Counter`` otherwise)
+instead of walking Python objects.
+"""
+import threading
+from array import array
+from collections import Counter
+from collections.abc import MutableSequence
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; Counter over the arrays is the fallback
+    numpy = None
+
+
+class Store(MutableSequence):
+    # Base for Article.all backends; the Article setters and deletes call
+    # these hooks so a backend can keep its own copy of each row current
+
+    # A backend that answers the catalog queries itself sets this to an
+    # object with ArticleIndex's interface (see Registry.article_index)
+    article_index = None
+
+    def row_changed(self, article):
+        pass
+
+    def row_deleted(self, article):
+        pass
+
+
+class ArticleStore(Store):
+    def __init__(self, articles=()):
+        # Rows and entity tables change together, so writers and the
+        # aggregates serialize on one lock
+        self._lock = threading.RLock()
+        self.clear()
+        self.extend(articles)
+
+    # --- Entity Tables ---
+
+    def _intern(self, ids, entities, entity):
+        entity_id = ids.get(entity)
+        if entity_id is None:
+            entity_id = ids[entity] = len(entities)
+            entities.append(entity)
+        return entity_id
+
+    def author_id(self, author):
+        return self._intern(self._author_ids, self.authors, author)
+
+    def magazine_id(self, magazine):
+        return self._intern(self._magazine_ids, self.magazines, magazine)
+
+    # --- Sequence Protocol ---
+
+    def __len__(self):
+        return len(self._articles)
+
+    def __getitem__(self, index):
+        return self._articles[index]
+
+    def __iter__(self):
+        return iter(self._articles)
+
+    def __contains__(self, article):
+        return article in self._rows
+
+    def append(self, article):
+        with self._lock:
+            self._rows[article] = len(self._articles)
+            self._articles.append(article)
+            self.author_ids.append(self.author_id(article.author))
+            self.magazine_ids.append(self.magazine_id(article.magazine))
+
+    def extend(self, articles):
+        with self._lock:
+            for article in articles:
+                self.append(article)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._articles = []
+        self._rows = {}
+        self.authors = []
+        self.magazines = []
+        self._author_ids = {}
+        self._magazine_ids = {}
+        self.author_ids = array('q')
+        self.magazine_ids = array('q')
+
+    # Anything other than appending renumbers rows, so rebuild the columns
+    def _rebuild(self, articles):
+        with self._lock:
+            self.clear()
+            self.extend(articles)
+
+    def __setitem__(self, index, value):
+        articles = list(self._articles)
+        articles[index] = value
+        self._rebuild(articles)
+
+    def __delitem__(self, index):
+        articles = list(self._articles)
+        del articles[index]
+        self._rebuild(articles)
+
+    def insert(self, index, article):
+        articles = list(self._articles)
+        articles.insert(index, article)
+        self._rebuild(articles)
+
+    def __repr__(self):
+        return f"ArticleStore({self._articles!r})"
+
+    # --- Write Hooks ---
+
+    def row_changed(self, article):
+        # Called by the Article author/magazine setters
+        with self._lock:
+            row = self._rows.get(article)
+            if row is not None:
+                self.author_ids[row] = self.author_id(article.author)
+                self.magazine_ids[row] = self.magazine_id(article.magazine)
+
+    def row_deleted(self, article):
+        # Deleted rows keep their place until the list is compacted, with
+        # ids of -1 so the aggregates skip them
+        with self._lock:
+            row = self._rows.get(article)
+            if row is not None:
+                self.author_ids[row] = -1
+                self.magazine_ids[row] = -1
+
+    def column_slices(self, count):
+        # (authors, magazines, [(first row, author ids, magazine ids), ...])
+        # with the rows cut into `count` contiguous ranges, all read under
+        # one lock so the slices and entity tables agree
+        with self._lock:
+            size = len(self._articles)
+            step = -(-size // max(1, count)) or 1
+            slices = [(start, self.author_ids[start:start + step],
+                       self.magazine_ids[start:start + step])
+                      for start in range(0, size, step)]
+            return list(self.authors), list(self.magazines), slices
+
+    # --- Vectorized Aggregates ---
+
+    def _bincount(self, ids, size):
+        if numpy is not None:
+            ids = numpy.asarray(ids, dtype=numpy.int64)
+            return numpy.bincount(ids[ids >= 0], minlength=size).tolist()
+        counts = Counter(ids)
+        return [counts.get(entity_id, 0) for entity_id in range(size)]
+
+    def magazine_counts(self):
+        with self._lock:
+            counts = self._bincount(self.magazine_ids, len(self.magazines))
+            return {magazine: count for magazine, count in zip(self.magazines, counts) if count}
+
+    def author_counts(self, magazine):
+        with self._lock:
+            return self._author_counts(magazine)
+
+    def _author_counts(self, magazine):
+        magazine_id = self._magazine_ids.get(magazine)
+        if magazine_id is None:
+            return {}
+        if numpy is not None:
+            authors = numpy.asarray(self.author_ids, dtype=numpy.int64)
+            magazines = numpy.asarray(self.magazine_ids, dtype=numpy.int64)
+            ids = authors[magazines == magazine_id]
+        else:
+            ids = array('q', (author_id for author_id, row_magazine
+                              in zip(self.author_ids, self.magazine_ids)
+                              if row_magazine == magazine_id))
+        counts = self._bincount(ids, len(self.authors))
+        return {author: count for author, count in zip(self.authors, counts) if count}
+
+    def top_publisher(self):
+        with self._lock:
+            counts = self.magazine_counts()
+            if not counts:
+                return None
+            # Ties go to the magazine that reached the count first, as in
+            # Magazine.top_publisher: the one whose latest article is oldest
+            latest = dict(zip(self.magazine_ids, range(len(self.magazine_ids))))
+            ids = self._magazine_ids
+            return max(counts, key=lambda magazine: (counts[magazine], -latest[ids[magazine]]))
+
+    def contributing_authors(self, magazine, threshold=2):
+        contributing = [author for author, count in self.author_counts(magazine).items()
+                        if count > threshold]
+        return contributing if contributing else None
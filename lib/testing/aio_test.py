@@ -0,0 +1,150 @@
+import asyncio
+import gc
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from lib.classes.aio import Catalog
+from lib.classes.many_to_many import Article, Author, BulkCreateError, Magazine
+from lib.classes.registry import Registry
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture
+def catalog():
+    catalog = Catalog()
+    yield catalog
+    catalog.close()
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+class TestCatalog:
+    def test_queries(self, catalog):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        for title in ("Dating life in NYC", "Shoes and the City", "How to wear a tutu"):
+            Article(carrie, vogue, title)
+
+        async def main():
+            return await asyncio.gather(
+                catalog.top_publisher(),
+                catalog.contributing_authors(vogue),
+                catalog.topic_areas(carrie),
+                carrie.atopic_areas(),
+                vogue.acontributing_authors(threshold=5),
+                catalog.search("city"),
+            )
+
+        top, contributing, areas, shared_areas, none, found = run(main())
+        assert top is vogue
+        assert contributing == [carrie]
+        assert areas == shared_areas == ["Fashion"]
+        assert none is None
+        assert [article.title for article in found] == ["Shoes and the City"]
+
+    def test_identical_requests_are_coalesced(self, catalog):
+        gate = threading.Event()
+        calls = []
+
+        def slow(value):
+            calls.append(value)
+            gate.wait(5)
+            return value * 2
+
+        async def main():
+            first = asyncio.ensure_future(catalog.call(slow, 21))
+            second = asyncio.ensure_future(catalog.call(slow, 21))
+            other = asyncio.ensure_future(catalog.call(slow, 1))
+            await asyncio.sleep(0.05)
+            gate.set()
+            return await asyncio.gather(first, second, other)
+
+        assert run(main()) == [42, 42, 2]
+        assert sorted(calls) == [1, 21]
+
+    def test_runs_inside_its_registry(self):
+        with Registry() as tenant:
+            vogue = Magazine("Vogue", "Fashion")
+            Article(Author("Carrie Bradshaw"), vogue, "Dating life in NYC")
+        catalog = Catalog(tenant)
+        try:
+            assert run(catalog.top_publisher()) is vogue
+        finally:
+            catalog.close()
+        assert Magazine.top_publisher() is None
+
+    def test_dropped_registry_is_freed(self):
+        with Registry() as tenant:
+            carrie = Author("Carrie Bradshaw")
+            Article(carrie, Magazine("Vogue", "Fashion"), "Dating life in NYC")
+        assert run(carrie.atopic_areas()) == ["Fashion"]
+
+        dropped = weakref.ref(tenant)
+        del tenant, carrie
+        gc.collect()
+        assert dropped() is None
+
+class TestIngest:
+    def test_ingest_from_an_async_source(self, catalog):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+
+        async def rows():
+            for number in range(25):
+                yield (carrie, vogue, f"Article number {number}")
+
+        assert run(catalog.ingest(rows(), batch_size=10)) == 25
+        assert [article.title for article in carrie.articles][-1] == "Article number 24"
+
+    def test_ingest_applies_backpressure(self):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        executor = ThreadPoolExecutor(1)
+        gate = threading.Event()
+        produced = []
+
+        async def rows():
+            for number in range(100):
+                produced.append(number)
+                yield (carrie, vogue, f"Article number {number}")
+
+        async def main():
+            # Occupy the only worker so the writer cannot drain the queue
+            executor.submit(gate.wait, 5)
+            catalog = Catalog(executor=executor)
+            ingest = asyncio.ensure_future(catalog.ingest(rows(), batch_size=5, max_pending=2))
+            await asyncio.sleep(0.05)
+            stalled_at = len(produced)
+            gate.set()
+            return stalled_at, await ingest
+
+        try:
+            stalled_at, created = run(main())
+        finally:
+            executor.shutdown()
+        # One batch with the writer, two queued and one waiting to be queued
+        assert stalled_at <= 5 * 4 + 1
+        assert created == 100
+        assert len(Article.all) == 100
+
+    def test_ingest_reports_source_positions(self, catalog):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        rows = [(carrie, vogue, f"Article number {number}") for number in range(12)]
+        rows[7] = (carrie, vogue, "Bad")
+
+        with pytest.raises(BulkCreateError) as error:
+            run(catalog.ingest(rows, batch_size=5))
+        assert error.value.errors == [(7, "Title must be between 5 and 50 characters, inclusive")]
+        assert len(Article.all) == 5
@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from lib.classes import analytics
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.store import ArticleStore
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture(params=[list, ArticleStore])
+def catalog(request):
+    Article.all = request.param()
+    authors = [Author(f"Author {i}") for i in range(6)]
+    magazines = [Magazine(f"Magazine {i}", f"Category {i % 3}") for i in range(5)]
+    Magazine("Empty Mag", "Niche")
+    Author("Idle Author")
+    Article.bulk_create((authors[(i * 7) % 6], magazines[(i * i) % 5], f"Article number {i}")
+                        for i in range(60))
+    return authors, magazines
+
+class TestAnalytics:
+
+    def test_matches_per_entity_methods(self, catalog):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            assert analytics.top_publisher(executor=pool) is Magazine.top_publisher()
+            for threshold in (2, 4):
+                contributing = analytics.contributing_authors(threshold, executor=pool)
+                assert contributing == {magazine: magazine.contributing_authors(threshold)
+                                        for magazine in Magazine.all}
+            topics = analytics.topic_areas(executor=pool)
+            assert topics == {author: author.topic_areas() for author in Author.all}
+
+    def test_throwaway_pool(self, catalog):
+        assert analytics.top_publisher(workers=2) is Magazine.top_publisher()
+
+    def test_skips_deleted_rows(self, catalog):
+        # Few enough deletes that the tombstones stay in place uncompacted
+        for article in Magazine.top_publisher().articles[:3]:
+            article.delete()
+        assert len(Article.all) == 60
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            assert analytics.top_publisher(executor=pool) is Magazine.top_publisher()
+            contributing = analytics.contributing_authors(1, executor=pool)
+            assert {magazine: set(found or ()) for magazine, found in contributing.items()} == \
+                {magazine: set(found or ())
+                 for magazine, found in Magazine.contributing_authors_all(1).items()}
+
+    @pytest.mark.parametrize("backend", [list, ArticleStore])
+    def test_empty_catalog(self, backend):
+        Article.all = backend()
+        m = Magazine("Vogue", "Fashion")
+        assert analytics.top_publisher(workers=1) is None
+        assert analytics.contributing_authors(workers=1) == {m: None}
+
+    def test_index_answers_unless_a_pool_is_asked_for(self, catalog, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError("no pool should be started")
+
+        monkeypatch.setattr(analytics, "ProcessPoolExecutor", no_pool)
+        assert analytics.top_publisher() is Magazine.top_publisher()
+        assert analytics.contributing_authors() == Magazine.contributing_authors_all()
+        assert analytics.topic_areas() == Author.topic_areas_all()
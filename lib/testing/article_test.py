@@ -1,5 +1,5 @@
 import pytest
-from classes.many_to_many import Author, Magazine, Article
+from classes.many_to_many import Author, Magazine, Article, BulkCreateError
 
 class TestArticle:
 
@@ -71,3 +71,113 @@ class TestArticle:
         assert hasattr(article, "title")
         assert hasattr(article, "author")
         assert hasattr(article, "magazine")
+
+    def test_bulk_create(self):
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        before = len(Article.all)
+        articles = Article.bulk_create([
+            (a, m, "Summer Fashion Tips"),
+            (a, m, "Winter Fashion Tips"),
+        ])
+        assert len(Article.all) == before + 2
+        assert [article.title for article in articles] == ["Summer Fashion Tips", "Winter Fashion Tips"]
+        assert a.articles == articles
+        assert m.contributors == [a]
+
+        with pytest.raises(AttributeError):
+            articles[0].title = "New Title"
+
+    def test_bulk_create_reports_every_bad_row(self):
+        """bulk_create rejects the whole batch and lists each bad row by index"""
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        before = len(Article.all)
+        with pytest.raises(BulkCreateError) as excinfo:
+            Article.bulk_create([
+                (a, m, "Summer Fashion Tips"),
+                (a, "Vogue", "Winter Fashion Tips"),
+                (a, m, "abc"),
+                (a, m),
+            ])
+        assert [index for index, _ in excinfo.value.errors] == [1, 2, 3]
+        assert len(Article.all) == before
+
+    def test_author_add_articles(self):
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        articles = a.add_articles([(m, "Summer Fashion Tips"), (m, "Winter Fashion Tips")])
+        assert all(article.author is a for article in articles)
+        assert m.article_titles() == ["Summer Fashion Tips", "Winter Fashion Tips"]
+
+        with pytest.raises(BulkCreateError):
+            a.add_articles([(m, "Valid Title Here"), "not a pair"])
+
+    def test_slotted_layout(self):
+        """articles, authors and magazines carry no per-instance __dict__"""
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        article = Article(a, m, "Summer Fashion Tips")
+        for obj in (a, m, article):
+            assert not hasattr(obj, "__dict__")
+            with pytest.raises(AttributeError):
+                obj.extra = 1
+
+    def test_delete(self):
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        keep = Article(a, m, "Summer Fashion Tips")
+        gone = Article(a, m, "Deleted Fashion Tips")
+
+        assert gone.delete()
+        assert gone.deleted
+        assert not gone.delete()
+        assert a.articles == [keep]
+        assert m.article_titles() == ["Summer Fashion Tips"]
+        assert m.contributions(a) == 1
+        assert Article.search("deleted", magazine=m) == []
+
+        Article.compact()
+        assert gone not in Article.all
+        assert keep in Article.all
+
+    def test_deleted_article_cannot_be_reassigned(self):
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        article = Article(a, m, "Summer Fashion Tips")
+        article.delete()
+
+        with pytest.raises(Exception):
+            article.magazine = m2
+        with pytest.raises(Exception):
+            article.author = Author("Samantha Jones")
+        assert article.magazine is m
+        assert m2.articles == []
+
+    def test_delete_where(self):
+        a = Author("Carry Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        articles = a.add_articles([(m, "Fashion Tip 1"), (m2, "Building Tip 1"), (m, "Fashion Tip 2")])
+
+        assert Article.delete_where(lambda article: article.magazine is m) == 2
+        assert [article for article in Article.all if article.author is a] == [articles[1]]
+        assert a.magazines == [m2]
+        assert a.topic_areas() == ["Architecture"]
+        assert m.article_titles() is None
+
+    def test_clearing_and_refilling_all_is_noticed(self):
+        a = Author("Carry Bradshaw")
+        b = Author("Samantha Jones")
+        m = Magazine("Vogue", "Fashion")
+        a.add_articles([(m, "Fashion Tip 1"), (m, "Fashion Tip 2")])
+        last = Article(b, m, "Fashion Tip 3")
+        assert len(a.articles) == 2
+
+        # Same length and same last article, but different contents
+        Article.all.clear()
+        refill = b.add_articles([(m, "Fashion Tip 4"), (m, "Fashion Tip 5")])
+        Article.all.append(last)
+        assert a.articles == []
+        assert b.articles == refill + [last]
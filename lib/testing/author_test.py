@@ -5,9 +5,11 @@ from lib.classes.many_to_many import Article, Author, Magazine
 @pytest.fixture(autouse=True)
 def setup_and_teardown():
     Article.all = []
+    Author.all = []
     Magazine.all = []
     yield
     Article.all = []
+    Author.all = []
     Magazine.all = []
 
 # Helper fixtures for consistency with other tests
@@ -113,4 +115,112 @@ class TestAuthor:
         
         expected = ["Technology", "Fashion"]
         # Use set to compare unique lists regardless of order
-        assert set(a.topic_areas()) == set(expected)
\ No newline at end of file
+        assert set(a.topic_areas()) == set(expected)
+
+    def test_articles_follow_author_reassignment(self, author_1, article_1):
+        """articles moves with an article when its author is reassigned."""
+        a2 = Author("Alice")
+        article_1.author = a2
+        assert author_1.articles == []
+        assert a2.articles == [article_1]
+
+    def test_articles_reset_with_article_all(self, author_1, article_1):
+        """articles is empty again once Article.all is cleared or replaced."""
+        Article.all.clear()
+        assert author_1.articles == []
+
+        Article.all.append(article_1)
+        assert author_1.articles == [article_1]
+
+        Article.all = []
+        assert author_1.articles == []
+
+    def test_find_by_name(self, author_1):
+        """find_by_name returns the registered author, or None."""
+        assert Author.find_by_name("Bob") is author_1
+        assert Author.find_by_name("Nobody") is None
+
+    def test_find_or_create(self, author_1):
+        """find_or_create reuses an existing author instead of duplicating it."""
+        assert Author.find_or_create("Bob") is author_1
+        alice = Author.find_or_create("Alice")
+        assert alice.name == "Alice"
+        assert Author.find_or_create("Alice") is alice
+        assert len(Author.all) == 2
+
+    def test_topic_areas_follow_recategorization(self, author_1, magazine_1):
+        """topic_areas reflects a magazine re-categorized after articles exist."""
+        m2 = Magazine("AD", "Architecture")
+        Article(author_1, magazine_1, "Fashion Tips for Summer")
+        Article(author_1, m2, "Modern Architecture Trends")
+        assert author_1.topic_areas() == ["Fashion", "Architecture"]
+
+        m2.category = "Fashion"
+        assert author_1.topic_areas() == ["Fashion"]
+
+        magazine_1.category = "Style"
+        assert sorted(author_1.topic_areas()) == ["Fashion", "Style"]
+
+    def test_lazy_accessors(self, author_1, magazine_1):
+        """iter_articles/iter_magazines are lazy; has_articles is a truth test."""
+        assert not author_1.has_articles()
+        assert next(author_1.iter_articles(), None) is None
+
+        m2 = Magazine("AD", "Architecture")
+        first = Article(author_1, magazine_1, "Fashion Tips for Summer")
+        Article(author_1, m2, "Modern Architecture Trends")
+        Article(author_1, m2, "Art Deco Buildings")
+
+        assert author_1.has_articles()
+        assert next(author_1.iter_articles()) is first
+        assert list(author_1.iter_articles()) == author_1.articles
+        assert list(author_1.iter_magazines()) == [magazine_1, m2]
+
+    def test_iteration_survives_writes(self, author_1, magazine_1):
+        """An iterator keeps going after new articles are indexed under it."""
+        first = Article(author_1, magazine_1, "Fashion Tips for Summer")
+        second = Article(author_1, magazine_1, "Fashion Tips for Winter")
+        articles = author_1.iter_articles()
+        assert next(articles) is first
+
+        latest = Article(author_1, magazine_1, "Fashion Tips for Spring")
+        assert magazine_1.articles == [first, second, latest]
+        assert list(articles) == [second]
+        assert list(author_1.iter_articles()) == [first, second, latest]
+
+    def test_articles_page(self, author_1, magazine_1):
+        """articles_page pages through an author's articles."""
+        articles = author_1.add_articles([(magazine_1, f"Article number {i}") for i in range(5)])
+        page = author_1.articles_page(after=articles[1].seq, limit=2)
+        assert page.articles == articles[2:4]
+        assert page.next_cursor == articles[3].seq
+
+    def test_topic_areas_all(self, author_1, magazine_1):
+        """topic_areas_all matches topic_areas for every author."""
+        a2 = Author("Alice")
+        Author("Idle")
+        m2 = Magazine("AD", "Architecture")
+        Article(author_1, magazine_1, "Fashion Tips for Summer")
+        Article(author_1, m2, "Modern Architecture Trends")
+        Article(a2, m2, "Art Deco Buildings")
+
+        assert Author.topic_areas_all() == {author: author.topic_areas() for author in Author.all}
+        assert Author.topic_areas_all()[a2] == ["Architecture"]
+
+    def test_most_prolific(self, author_1, magazine_1):
+        """most_prolific ranks authors by article count, optionally since a seq."""
+        assert Author.most_prolific(2) is None
+        a2 = Author("Alice")
+        a3 = Author("Idle")
+        early = author_1.add_articles([(magazine_1, f"Fashion Tip {i}") for i in range(3)])
+        late = a2.add_articles([(magazine_1, f"Style Note {i}") for i in range(2)])
+
+        assert Author.most_prolific(2) == [author_1, a2]
+        assert Author.most_prolific(5, since=late[0].seq) == [a2]
+        assert Author.most_prolific(5, since=early[2].seq) == [a2, author_1]
+
+        early[0].author = a3
+        late[0].delete()
+        # a3 reached one article before a2 dropped back to one
+        assert Author.most_prolific(3) == [author_1, a3, a2]
+        assert a3 not in Author.most_prolific(3, since=early[1].seq)
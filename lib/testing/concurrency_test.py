@@ -0,0 +1,144 @@
+import random
+import sys
+import threading
+from collections import Counter
+
+import pytest
+from lib.classes.indexes import ArticleIndex
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import Registry
+from lib.classes.store import ArticleStore
+
+# Fixture for clearing global state and forcing frequent thread switches
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    sys.setswitchinterval(interval)
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+def hammer(writers, readers, work):
+    errors = []
+
+    def run(task, seed):
+        try:
+            task(random.Random(seed))
+        except Exception as error:  # surfaced in the main thread below
+            errors.append(error)
+
+    threads = [threading.Thread(target=run, args=(work[kind], seed))
+               for seed, kind in enumerate(["write"] * writers + ["read"] * readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+class TestConcurrency:
+
+    @pytest.mark.parametrize("backend", [list, ArticleStore])
+    def test_concurrent_creates_and_reads_stay_consistent(self, backend):
+        Article.all = backend()
+        authors = [Author(f"Author {i}") for i in range(8)]
+        magazines = [Magazine(f"Magazine {i}", f"Category {i % 3}") for i in range(5)]
+        created = 400
+
+        def write(rng):
+            for i in range(created):
+                article = Article(rng.choice(authors), rng.choice(magazines), f"Article number {i}")
+                if i % 7 == 0:
+                    article.author = rng.choice(authors)
+                if i % 11 == 0:
+                    article.magazine = rng.choice(magazines)
+                if i % 50 == 0:
+                    rng.choice(magazines).category = f"Category {rng.randrange(3)}"
+
+        def read(rng):
+            for _ in range(created):
+                author = rng.choice(authors)
+                magazine = rng.choice(magazines)
+                assert all(article.author is not None for article in author.articles)
+                magazine.contributors
+                magazine.contributing_authors()
+                magazine.article_titles()
+                author.topic_areas()
+                Magazine.top_publisher()
+                Magazine.top_publishers(3)
+
+        hammer(4, 4, {"write": write, "read": read})
+
+        # Compare every index against a recount of the final catalog
+        assert len(Article.all) == 4 * created
+        assert sum(len(author.articles) for author in authors) == len(Article.all)
+        assert sum(len(magazine.articles) for magazine in magazines) == len(Article.all)
+        magazine_counts = Counter(article.magazine for article in Article.all)
+        for magazine in magazines:
+            pairs = Counter(a.author for a in Article.all if a.magazine is magazine)
+            assert {author: magazine.contributions(author) for author in pairs} == pairs
+            assert set(magazine.contributors) == set(pairs)
+        top = Magazine.top_publisher()
+        assert magazine_counts[top] == max(magazine_counts.values())
+        for author in authors:
+            categories = {a.magazine.category for a in Article.all if a.author is author}
+            assert set(author.topic_areas() or ()) == categories
+        if backend is ArticleStore:
+            assert Article.all.magazine_counts() == dict(magazine_counts)
+
+    def test_concurrent_find_or_create_does_not_duplicate(self):
+        def write(rng):
+            for i in range(200):
+                Author.find_or_create(f"Author {rng.randrange(20)}")
+                Magazine.find_or_create(f"Magazine {rng.randrange(20)}", "News")
+
+        hammer(8, 0, {"write": write})
+        assert len({author.name for author in Author.all}) == len(Author.all)
+        assert len({magazine.name for magazine in Magazine.all}) == len(Magazine.all)
+
+    def test_reader_mid_write_does_not_cache_stale_lists(self, monkeypatch):
+        author = Author("Bob")
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        article = Article(author, m1, "Fashion Tips")
+        assert author.magazines == [m1]
+
+        count = ArticleIndex._count
+
+        def interrupted(index, mapping, outer, inner, delta):
+            count(index, mapping, outer, inner, delta)
+            # A lock-free reader running between the two count updates
+            if mapping is index.authors_by_magazine:
+                author.magazines
+
+        monkeypatch.setattr(ArticleIndex, "_count", interrupted)
+        article.magazine = m2
+        monkeypatch.undo()
+        assert author.magazines == [m2]
+
+    def test_catch_up_ignores_appends_made_while_it_runs(self):
+        class Growing(list):
+            # Appends a pending article the moment the index slices the list
+            pending = []
+
+            def __getitem__(self, index):
+                if isinstance(index, slice) and self.pending:
+                    self.append(self.pending.pop())
+                return super().__getitem__(index)
+
+        items = Article.all = Growing()
+        author = Author("Bob")
+        magazine = Magazine("Vogue", "Fashion")
+        first = Article(author, magazine, "Fashion Tips")
+        second = Article(author, magazine, "More Fashion Tips")
+        items.pop()
+        items.pending = [second]
+
+        index = Registry.current().article_index
+        index.sync()
+        assert index._size == 1 and index._last is first
+        assert author.articles == [first, second]
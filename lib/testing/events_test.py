@@ -0,0 +1,117 @@
+import pytest
+from lib.classes.events import Event, coalesce
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import Registry
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture
+def received():
+    batches = []
+    events = Registry.current().events
+    events.subscribe(batches.append)
+    yield batches
+    events.unsubscribe(batches.append)
+
+class TestEvents:
+    def test_article_creation_and_reassignment(self, received):
+        carrie = Author("Carrie Bradshaw")
+        samantha = Author("Samantha Jones")
+        vogue = Magazine("Vogue", "Fashion")
+        yorker = Magazine("AD", "Architecture")
+        article = Article(carrie, vogue, "How to wear a tutu with style")
+        article.author = samantha
+        article.magazine = yorker
+        assert received == [
+            [Event('created', article, None, None, None)],
+            [Event('changed', article, 'author', carrie, samantha)],
+            [Event('changed', article, 'magazine', vogue, yorker)],
+        ]
+
+    def test_magazine_reassignment(self, received):
+        vogue = Magazine("Vogue", "Fashion")
+        assert received == []
+        vogue.name = "Vogue Paris"
+        vogue.category = "Style"
+        assert received == [
+            [Event('changed', vogue, 'name', "Vogue", "Vogue Paris")],
+            [Event('changed', vogue, 'category', "Fashion", "Style")],
+        ]
+
+    def test_deletes(self, received):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        first = Article(carrie, vogue, "How to wear a tutu with style")
+        second = Article(carrie, vogue, "Dating life in NYC")
+        received.clear()
+        assert first.delete()
+        assert not first.delete()
+        Article.delete_where(lambda article: True)
+        assert received == [
+            [Event('deleted', first, None, None, None)],
+            [Event('deleted', second, None, None, None)],
+        ]
+
+    def test_bulk_create_publishes_one_batch(self, received):
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        articles = Article.bulk_create([(carrie, vogue, "Dating life in NYC")] * 3)
+        assert received == [[Event('created', article, None, None, None) for article in articles]]
+
+    def test_batches_are_coalesced(self, received):
+        carrie = Author("Carrie Bradshaw")
+        samantha = Author("Samantha Jones")
+        charlotte = Author("Charlotte York")
+        vogue = Magazine("Vogue", "Fashion")
+        moved = Article(carrie, vogue, "How to wear a tutu with style")
+        returned = Article(carrie, vogue, "Dating life in NYC")
+        received.clear()
+
+        with Registry.current().events.batch():
+            moved.author = samantha
+            moved.author = charlotte
+            returned.author = samantha
+            returned.author = carrie
+            created = Article(carrie, vogue, "Shoes and the City")
+            created.author = samantha
+            assert received == []
+
+        assert received == [[
+            Event('changed', moved, 'author', carrie, charlotte),
+            Event('created', created, None, None, None),
+        ]]
+
+    def test_created_then_deleted_cancels_out(self):
+        article = object()
+        events = [Event('created', article, None, None, None),
+                  Event('deleted', article, None, None, None)]
+        assert coalesce(events) == []
+
+    def test_unsubscribed_catalog_publishes_nothing(self):
+        events = Registry.current().events
+        assert events.subscribers == ()
+        carrie = Author("Carrie Bradshaw")
+        vogue = Magazine("Vogue", "Fashion")
+        with events.batch():
+            Article(carrie, vogue, "How to wear a tutu with style")
+        received = []
+        events.subscribe(received.append)
+        events.unsubscribe(received.append)
+        Article(carrie, vogue, "Dating life in NYC")
+        assert received == []
+
+    def test_registries_have_their_own_bus(self, received):
+        with Registry():
+            carrie = Author("Carrie Bradshaw")
+            vogue = Magazine("Vogue", "Fashion")
+            Article(carrie, vogue, "How to wear a tutu with style")
+        assert received == []
@@ -0,0 +1,74 @@
+import pytest
+from lib.classes import instrumentation
+from lib.classes.many_to_many import Article, Author, Magazine
+
+# Fixture for clearing global state and metrics before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture
+def catalog():
+    carrie = Author("Carrie Bradshaw")
+    vogue = Magazine("Vogue", "Fashion")
+    Article(carrie, vogue, "How to wear a tutu with style")
+    Article(carrie, vogue, "Dating life in NYC")
+    return carrie, vogue
+
+class TestInstrumentation:
+    def test_disabled_leaves_the_classes_untouched(self, catalog):
+        original = Magazine.__dict__['contributors']
+        instrumentation.enable()
+        assert instrumentation.enabled()
+        assert Magazine.__dict__['contributors'] is not original
+        instrumentation.disable()
+        assert not instrumentation.enabled()
+        assert Magazine.__dict__['contributors'] is original
+        catalog[1].contributors
+        assert instrumentation.stats() == {}
+
+    def test_records_calls_latency_and_result_size(self, catalog):
+        carrie, vogue = catalog
+        instrumentation.enable()
+        assert len(carrie.articles) == 2
+        assert carrie.articles_page(limit=1).next_cursor is not None
+        assert Magazine.top_publisher() is vogue
+        assert vogue.contributing_authors(threshold=0) == [carrie]
+        assert Magazine.contributing_authors_all(threshold=5) == {vogue: None}
+
+        stats = instrumentation.stats()
+        assert stats['Author.articles']['calls'] == 1
+        assert stats['Author.articles']['result_size'] == 2
+        assert stats['Author.articles_page']['result_size'] == 1
+        assert stats['Magazine.top_publisher']['result_size'] == 1
+        assert stats['Magazine.contributing_authors']['result_size'] == 1
+        summary = stats['Magazine.top_publisher']
+        assert 0 <= summary['p50'] <= summary['p90'] <= summary['p99'] <= summary['max']
+        assert summary['total_seconds'] >= summary['max']
+        assert 'Magazine.contributors' not in stats
+
+    def test_setters_still_work_while_enabled(self, catalog):
+        carrie, vogue = catalog
+        instrumentation.enable()
+        article = carrie.articles[0]
+        article.magazine = Magazine("AD", "Architecture")
+        assert len(vogue.articles) == 1
+
+    def test_prometheus_export(self, catalog):
+        instrumentation.enable()
+        Magazine.top_publisher()
+        Magazine.top_publisher()
+        text = instrumentation.to_prometheus()
+        assert '# TYPE catalog_call_seconds summary' in text
+        assert 'catalog_call_seconds_count{method="Magazine.top_publisher"} 2' in text
+        assert 'catalog_call_seconds{method="Magazine.top_publisher",quantile="0.99"}' in text
+        assert 'catalog_result_size_total{method="Magazine.top_publisher"} 2' in text
@@ -1,13 +1,19 @@
+import random
+from collections import Counter
+
 import pytest
+from lib.classes.indexes import SequenceBuckets
 from lib.classes.many_to_many import Article, Author, Magazine
 
 # Fixture for clearing global state before and after every test
 @pytest.fixture(autouse=True)
 def setup_and_teardown():
     Article.all = []
+    Author.all = []
     Magazine.all = []
     yield
     Article.all = []
+    Author.all = []
     Magazine.all = []
 
 # Helper fixtures for consistency with other tests
@@ -158,4 +164,280 @@ class TestMagazine:
         Article(a2, m, "Art 3") # This is article 2 for A2
         
         # Neither author has > 2 articles
-        assert m.contributing_authors() is None
\ No newline at end of file
+        assert m.contributing_authors() is None
+
+    def test_articles_follow_magazine_reassignment(self, magazine_1, article_1):
+        """articles moves with an article when its magazine is reassigned."""
+        m2 = Magazine("AD", "Architecture")
+        article_1.magazine = m2
+        assert magazine_1.articles == []
+        assert m2.articles == [article_1]
+        assert magazine_1.article_titles() is None
+
+    def test_top_publisher_follows_reassignment(self):
+        """top_publisher is kept up to date when articles change magazine."""
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a = Author("Bob")
+        first = Article(a, m1, "Fashion Tips")
+        Article(a, m1, "More Fashion Tips")
+        Article(a, m2, "Architecture Guide")
+        assert Magazine.top_publisher() is m1
+
+        first.magazine = m2
+        assert Magazine.top_publisher() is m2
+
+    def test_top_publisher_ties_go_to_the_first_to_reach_the_count(self):
+        """A tie goes to the magazine that reached the leading count first."""
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a = Author("Bob")
+        Article(a, m1, "Fashion Tips")
+        Article(a, m2, "Architecture Guide")
+        Article(a, m2, "Building Guide")
+        Article(a, m1, "More Fashion Tips")
+
+        # m1 appeared first, but m2 got to two articles first
+        assert Magazine.top_publisher() is m2
+        assert Magazine.top_publishers(2) == [m2, m1]
+
+    def test_top_publishers(self):
+        """top_publishers ranks magazines by article count, ties in arrival order."""
+        assert Magazine.top_publishers(3) is None
+
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        m3 = Magazine("Wired", "Technology")
+        a = Author("Bob")
+        Article(a, m2, "Architecture Guide")
+        Article(a, m3, "Gadget Roundup")
+        Article(a, m1, "Fashion Tips")
+        Article(a, m3, "More Gadgets")
+
+        assert Magazine.top_publishers(3) == [m3, m2, m1]
+        assert Magazine.top_publishers(1) == [m3]
+        for n in (0, -1, 1.5):
+            with pytest.raises(Exception):
+                Magazine.top_publishers(n)
+            with pytest.raises(Exception):
+                Magazine.top_publishers(n, since=0)
+
+    def test_contributing_authors_threshold(self):
+        """contributing_authors takes a configurable threshold."""
+        m = Magazine("Vogue", "Fashion")
+        a1 = Author("Bob")
+        a2 = Author("Alice")
+        Article(a1, m, "A1 Tip 1")
+        Article(a1, m, "A1 Tip 2")
+        Article(a2, m, "A2 Tip 1")
+
+        assert m.contributing_authors(threshold=1) == [a1]
+        assert m.contributing_authors(threshold=0) == [a1, a2]
+        assert m.contributing_authors(threshold=5) is None
+
+    def test_contributions_follow_reassignment(self):
+        """contributions and contributors are updated on author reassignment."""
+        m = Magazine("Vogue", "Fashion")
+        a1 = Author("Bob")
+        a2 = Author("Alice")
+        article = Article(a1, m, "A1 Tip 1")
+        Article(a1, m, "A1 Tip 2")
+        assert m.contributions(a1) == 2
+        assert m.contributions(a2) == 0
+
+        article.author = a2
+        assert m.contributions(a1) == 1
+        assert m.contributions(a2) == 1
+        assert m.contributors == [a1, a2]
+
+    def test_find_by_name_follows_rename(self, magazine_1):
+        """find_by_name stays correct when a magazine is renamed."""
+        assert Magazine.find_by_name("Vogue") is magazine_1
+        magazine_1.name = "Vogue Paris"
+        assert Magazine.find_by_name("Vogue") is None
+        assert Magazine.find_by_name("Vogue Paris") is magazine_1
+
+    def test_find_or_create(self, magazine_1):
+        """find_or_create reuses an existing magazine instead of duplicating it."""
+        assert Magazine.find_or_create("Vogue", "Fashion") is magazine_1
+        ad = Magazine.find_or_create("AD", "Architecture")
+        assert ad.category == "Architecture"
+        assert Magazine.all == [magazine_1, ad]
+
+    def test_by_category_follows_recategorization(self, magazine_1):
+        """by_category returns magazines by their current category."""
+        m2 = Magazine("Elle", "Fashion")
+        assert Magazine.by_category("Fashion") == [magazine_1, m2]
+
+        m2.category = "Lifestyle"
+        assert Magazine.by_category("Fashion") == [magazine_1]
+        assert Magazine.by_category("Lifestyle") == [m2]
+        assert Magazine.by_category("News") == []
+
+    def test_memoized_results_invalidate_per_magazine(self):
+        """contributors and article_titles are cached until that magazine changes."""
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a = Author("Bob")
+        Article(a, m1, "Fashion Tips")
+        Article(a, m2, "Architecture Guide")
+
+        assert m1.article_titles() == ["Fashion Tips"]
+        assert m2.contributors == [a]
+        before = Article.cache_info()
+        assert m1.article_titles() == ["Fashion Tips"]
+        assert m2.contributors == [a]
+        after = Article.cache_info()
+        assert after["hits"] == before["hits"] + 2
+        assert after["misses"] == before["misses"]
+
+        Article(a, m1, "More Fashion Tips")
+        assert m1.article_titles() == ["Fashion Tips", "More Fashion Tips"]
+        assert m2.contributors == [a]
+        latest = Article.cache_info()
+        assert latest["misses"] == after["misses"] + 1
+        assert latest["hits"] == after["hits"] + 1
+
+        m2.contributors.append("not an author")
+        assert m2.contributors == [a]
+
+    def test_lazy_accessors(self, magazine_1, article_1):
+        """iter_articles/iter_contributors are lazy; has_articles is a truth test."""
+        assert magazine_1.has_articles()
+        assert not Magazine("AD", "Architecture").has_articles()
+        assert list(magazine_1.iter_articles()) == [article_1]
+        assert list(magazine_1.iter_contributors()) == [article_1.author]
+
+    def test_articles_page(self, magazine_1):
+        """articles_page walks the articles with a cursor, in either order."""
+        a = Author("Bob")
+        titles = ["Delta Tips", "Alpha Tips", "Echo Tips", "Charlie Tips", "Bravo Tips"]
+        articles = a.add_articles([(magazine_1, title) for title in titles])
+
+        page = magazine_1.articles_page(limit=2)
+        assert page.articles == articles[:2]
+        page = magazine_1.articles_page(after=page.next_cursor, limit=2)
+        assert page.articles == articles[2:4]
+        page = magazine_1.articles_page(after=page.next_cursor, limit=2)
+        assert page.articles == articles[4:]
+        assert page.next_cursor is None
+
+        page = magazine_1.articles_page(limit=3, order="title")
+        assert [article.title for article in page.articles] == ["Alpha Tips", "Bravo Tips", "Charlie Tips"]
+        # Articles added after the cursor was handed out still show up in place
+        Article(a, magazine_1, "Baker Tips")
+        page = magazine_1.articles_page(after=page.next_cursor, order="title")
+        assert [article.title for article in page.articles] == ["Delta Tips", "Echo Tips"]
+
+        with pytest.raises(Exception):
+            magazine_1.articles_page(order="random")
+
+    def test_article_titles_ordered(self, magazine_1):
+        """article_titles keeps insertion order across reassignment, or sorts by title."""
+        m2 = Magazine("AD", "Architecture")
+        a = Author("Bob")
+        first = Article(a, magazine_1, "Zebra Prints")
+        Article(a, magazine_1, "Animal Prints")
+        first.magazine = m2
+        first.magazine = magazine_1
+        assert magazine_1.article_titles() == ["Zebra Prints", "Animal Prints"]
+        assert magazine_1.article_titles(order="title") == ["Animal Prints", "Zebra Prints"]
+
+    def test_contributing_authors_all(self, magazine_1):
+        """contributing_authors_all matches contributing_authors for every magazine."""
+        m2 = Magazine("AD", "Architecture")
+        a1 = Author("Bob")
+        a2 = Author("Alice")
+        a1.add_articles([(magazine_1, f"Fashion Tip {i}") for i in range(3)])
+        a2.add_articles([(m2, f"Building Tip {i}") for i in range(2)])
+
+        for threshold in (0, 1, 2):
+            assert Magazine.contributing_authors_all(threshold) == {
+                magazine: magazine.contributing_authors(threshold) for magazine in Magazine.all}
+        assert Magazine.contributing_authors_all() == {magazine_1: [a1], m2: None}
+
+    def test_top_publisher_after_delete(self):
+        """top_publisher and contributing_authors drop deleted articles."""
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a = Author("Bob")
+        vogue = a.add_articles([(m1, f"Fashion Tip {i}") for i in range(3)])
+        a.add_articles([(m2, f"Building Tip {i}") for i in range(2)])
+        assert Magazine.top_publisher() is m1
+        assert m1.contributing_authors() == [a]
+
+        vogue[0].delete()
+        vogue[1].delete()
+        assert Magazine.top_publisher() is m2
+        assert m1.contributing_authors() is None
+        assert len(Article.all) == 3
+
+    def test_top_publishers_since(self, monkeypatch):
+        """top_publishers(n, since=...) only counts articles from that seq on."""
+        monkeypatch.setattr(SequenceBuckets, "WIDTH", 4)
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        m3 = Magazine("Wired", "Technology")
+        a = Author("Bob")
+        old = a.add_articles([(m1, f"Fashion Tip {i}") for i in range(6)])
+        recent = a.add_articles([(m2, f"Building Tip {i}") for i in range(3)]
+                                + [(m3, f"Gadget Tip {i}") for i in range(2)])
+
+        assert Magazine.top_publishers(2) == [m1, m2]
+        assert Magazine.top_publishers(2, since=recent[0].seq) == [m2, m3]
+        assert Magazine.top_publishers(3, since=old[4].seq) == [m2, m1, m3]
+        assert Magazine.top_publishers(1, since=recent[-1].seq + 1) is None
+
+        recent[0].magazine = m3
+        recent[1].delete()
+        assert Magazine.top_publishers(2, since=recent[0].seq) == [m3, m2]
+
+    def test_windowed_counts_match_a_scan(self, monkeypatch):
+        """Windowed rankings agree with counting Article.all directly."""
+        monkeypatch.setattr(SequenceBuckets, "WIDTH", 8)
+        rng = random.Random(7)
+        magazines = [Magazine(f"Magazine {i}", "News") for i in range(5)]
+        authors = [Author(f"Author {i}") for i in range(5)]
+        articles = [Article(rng.choice(authors), rng.choice(magazines), f"Article {i}")
+                    for i in range(120)]
+        seqs = [article.seq for article in articles]
+        for article in rng.sample(articles, 30):
+            article.magazine = rng.choice(magazines)
+            article.author = rng.choice(authors)
+        for article in rng.sample(articles, 20):
+            article.delete()
+
+        for since in (seqs[0], seqs[37], seqs[101], seqs[-1], seqs[-1] + 1):
+            live = [article for article in Article.all
+                    if not article.deleted and article.seq >= since]
+            for field, rank in (("magazine", Magazine.top_publishers),
+                                ("author", Author.most_prolific)):
+                counts = Counter(getattr(article, field) for article in live)
+                ranked = rank(3, since=since) or []
+                assert [counts[entity] for entity in ranked] == \
+                    sorted(counts.values(), reverse=True)[:3]
+
+    def test_windowed_counts_add_up_runs_of_buckets(self, monkeypatch):
+        """Every window start gets exact counts from the bucket runs."""
+        monkeypatch.setattr(SequenceBuckets, "WIDTH", 2)
+        rng = random.Random(11)
+        magazines = [Magazine(f"Magazine {i}", "News") for i in range(4)]
+        author = Author("Bob")
+        windows = SequenceBuckets()
+        articles = author.add_articles([(rng.choice(magazines), f"Article {i}")
+                                        for i in range(100)])
+        windows.add_many(articles[:60])
+        for article in articles[60:]:
+            windows.add(article)
+        for article in articles[::7]:
+            windows.remove(article)
+        live = [article for position, article in enumerate(articles) if position % 7]
+        for article in live[3::9]:
+            old, article.magazine = article.magazine, rng.choice(magazines)
+            windows.moved(article, "magazines", old, article.magazine)
+
+        for since in range(articles[0].seq - 1, articles[-1].seq + 2):
+            expected = Counter(article.magazine for article in live if article.seq >= since)
+            assert windows.counts("magazine", since) == dict(expected)
+            assert windows.counts("author", since) == (
+                {author: sum(expected.values())} if expected else {})
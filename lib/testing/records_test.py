@@ -0,0 +1,90 @@
+import json
+
+import pytest
+from lib.classes.many_to_many import Article, Author, BulkCreateError, Magazine
+from lib.classes.records import export_articles, import_articles, iter_records
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+CSV = """author,magazine,category,title
+Carrie Bradshaw,Vogue,Fashion,The Dress Dilemma
+Carrie Bradshaw,Vogue,Fashion,Shoes and the City
+Samantha Jones,The New Yorker,News,Dating in NYC
+"""
+
+class TestRecords:
+
+    def test_import_csv_resolves_entities_by_name(self, tmp_path):
+        vogue = Magazine("Vogue", "Fashion")
+        path = tmp_path / "articles.csv"
+        path.write_text(CSV)
+
+        assert import_articles(path, batch_size=2) == 3
+        assert [author.name for author in Author.all] == ["Carrie Bradshaw", "Samantha Jones"]
+        assert Magazine.all[0] is vogue
+        assert vogue.article_titles() == ["The Dress Dilemma", "Shoes and the City"]
+        assert Magazine.find_by_name("The New Yorker").category == "News"
+
+    def test_round_trip_jsonl(self, tmp_path):
+        a = Author("Carrie Bradshaw")
+        m = Magazine("Vogue", "Fashion")
+        a.add_articles([(m, "The Dress Dilemma"), (m, "Café Society")])
+        path = tmp_path / "articles.jsonl"
+
+        assert export_articles(path) == 2
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert json.loads(lines[1]) == {"author": "Carrie Bradshaw", "magazine": "Vogue",
+                                        "category": "Fashion", "title": "Café Society"}
+
+        Article.all, Author.all, Magazine.all = [], [], []
+        assert import_articles(path) == 2
+        assert list(iter_records()) == [json.loads(line) for line in lines]
+
+    def test_export_csv(self, tmp_path):
+        Author("Bob").add_article(Magazine("Vogue", "Fashion"), "Fashion Tips")
+        path = tmp_path / "out.csv"
+        export_articles(path)
+        assert path.read_text().splitlines() == ["author,magazine,category,title",
+                                                 "Bob,Vogue,Fashion,Fashion Tips"]
+
+    def test_bad_records_are_reported_by_position(self, tmp_path):
+        path = tmp_path / "articles.csv"
+        path.write_text(CSV + "Miranda Hobbes,V,Law,Too short magazine name\n"
+                              "Miranda Hobbes,Vogue,Fashion,Tiny\n")
+        with pytest.raises(BulkCreateError) as excinfo:
+            import_articles(path, batch_size=2)
+        assert [index for index, _ in excinfo.value.errors] == [3]
+
+    def test_bad_title_leaves_no_entities_behind(self, tmp_path):
+        path = tmp_path / "articles.jsonl"
+        path.write_text('{"author": "Miranda Hobbes", "magazine": "Law Review", '
+                        '"category": "Law", "title": "Partners and Partners"}\n'
+                        '{"author": "Bob", "magazine": "Vogue", "category": "Fashion", '
+                        '"title": "Tiny"}\n')
+        with pytest.raises(BulkCreateError) as excinfo:
+            import_articles(path)
+        assert excinfo.value.errors == [(1, "Title must be between 5 and 50 characters, inclusive")]
+        assert Author.all == [] and Magazine.all == [] and Article.all == []
+
+    def test_bad_magazine_name_leaves_no_entities_behind(self, tmp_path):
+        path = tmp_path / "articles.csv"
+        path.write_text("author,magazine,category,title\n"
+                        "Alice,Vogue,Fashion,The Dress Dilemma\n"
+                        "Bob,A Magazine Name Too Long,Fashion,Shoes and the City\n")
+        with pytest.raises(BulkCreateError) as excinfo:
+            import_articles(path)
+        assert excinfo.value.errors == [(1, "Name must be between 2 and 16 characters, inclusive")]
+        assert Author.all == [] and Magazine.all == [] and Article.all == []
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(Exception):
+            import_articles(tmp_path / "articles.xml")
@@ -0,0 +1,104 @@
+import threading
+
+import pytest
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import DEFAULT, Registry
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+class TestRegistry:
+    def test_default_registry_is_current(self):
+        assert Registry.current() is DEFAULT
+        author = Author("Carrie Bradshaw")
+        assert Author.all is DEFAULT.authors
+        assert Author.all == [author]
+
+    def test_registries_are_isolated(self):
+        author = Author("Carrie Bradshaw")
+        magazine = Magazine("Vogue", "Fashion")
+        Article(author, magazine, "How to wear a tutu with style")
+
+        with Registry() as tenant:
+            assert Article.all == []
+            assert Author.find_by_name("Carrie Bradshaw") is None
+            assert Magazine.top_publisher() is None
+            other = Author("Carrie Bradshaw")
+            vogue = Magazine("Vogue", "Fashion")
+            Article(other, vogue, "Dating life in NYC")
+            Article(other, vogue, "Shoes and the City")
+            assert Magazine.top_publisher() is vogue
+            assert Author.find_by_name("Carrie Bradshaw") is other
+
+        assert tenant.authors == [other]
+        assert len(tenant.articles) == 2
+        assert Author.all == [author]
+        assert len(Article.all) == 1
+        assert Magazine.top_publisher() is magazine
+        assert author.articles[0].title == "How to wear a tutu with style"
+        assert other.topic_areas() == ["Fashion"]
+
+    def test_instances_answer_from_their_own_registry(self):
+        with Registry():
+            author = Author("Carrie Bradshaw")
+            magazine = Magazine("Vogue", "Fashion")
+            Article(author, magazine, "How to wear a tutu with style")
+        # Read outside the tenant's context
+        assert len(author.articles) == 1
+        assert magazine.contributors == [author]
+        assert Article.all == []
+
+    def test_cannot_mix_registries(self):
+        author = Author("Carrie Bradshaw")
+        magazine = Magazine("Vogue", "Fashion")
+        article = Article(author, magazine, "How to wear a tutu with style")
+        with Registry():
+            other = Author("Samantha Jones")
+            with pytest.raises(Exception):
+                Article(author, magazine, "Dating life in NYC")
+            with pytest.raises(Exception):
+                article.author = other
+
+    def test_nested_registries(self):
+        outer, inner = Registry(), Registry()
+        with outer:
+            Author("Carrie Bradshaw")
+            with inner:
+                Author("Samantha Jones")
+                assert Registry.current() is inner
+            assert Registry.current() is outer
+        assert [author.name for author in outer.authors] == ["Carrie Bradshaw"]
+        assert [author.name for author in inner.authors] == ["Samantha Jones"]
+        assert Registry.current() is DEFAULT
+
+    def test_threads_see_their_own_registry(self):
+        tenants = [Registry() for _ in range(4)]
+        barrier = threading.Barrier(len(tenants))
+
+        def work(number, tenant):
+            with tenant:
+                barrier.wait()
+                author = Author(f"Author {number}")
+                magazine = Magazine(f"Magazine {number}", "News")
+                for _ in range(number + 1):
+                    Article(author, magazine, "Dating life in NYC")
+
+        threads = [threading.Thread(target=work, args=(number, tenant))
+                   for number, tenant in enumerate(tenants)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for number, tenant in enumerate(tenants):
+            assert [author.name for author in tenant.authors] == [f"Author {number}"]
+            assert len(tenant.articles) == number + 1
+        assert Article.all == []
@@ -0,0 +1,66 @@
+import pytest
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.search import tokenize
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture
+def catalog():
+    carrie = Author("Carrie Bradshaw")
+    samantha = Author("Samantha Jones")
+    vogue = Magazine("Vogue", "Fashion")
+    yorker = Magazine("The New Yorker", "News")
+    articles = Article.bulk_create([
+        (carrie, vogue, "The Dress Dilemma"),
+        (carrie, vogue, "Shoes and the City"),
+        (carrie, yorker, "Coffee in the City"),
+        (samantha, yorker, "Dating in the City"),
+        (samantha, vogue, "Dresses for Dating"),
+    ])
+    return carrie, samantha, vogue, yorker, articles
+
+class TestSearch:
+
+    def test_tokenize(self):
+        assert tokenize("Dating in NYC: Part 1") == ["dating", "in", "nyc", "part", "1"]
+
+    def test_every_word_must_match(self, catalog):
+        *_, articles = catalog
+        assert Article.search("city") == articles[1:4]
+        assert Article.search("the CITY coffee") == [articles[2]]
+        assert Article.search("city dilemma") == []
+        assert Article.search("") == []
+
+    def test_prefix_matching(self, catalog):
+        *_, articles = catalog
+        assert Article.search("dress") == [articles[0], articles[4]]
+        assert Article.search("dress", prefix=False) == [articles[0]]
+
+    def test_fuzzy_matching(self, catalog):
+        *_, articles = catalog
+        assert Article.search("dilemna") == []
+        assert Article.search("dilemna", fuzzy=True) == [articles[0]]
+
+    def test_restricted_to_magazine_or_author(self, catalog):
+        carrie, samantha, vogue, yorker, articles = catalog
+        assert Article.search("city", magazine=yorker) == [articles[2], articles[3]]
+        assert Article.search("city", author=carrie) == [articles[1], articles[2]]
+        assert Article.search("city", magazine=yorker, author=samantha) == [articles[3]]
+
+    def test_follows_new_articles_and_reassignment(self, catalog):
+        carrie, samantha, vogue, yorker, articles = catalog
+        latest = Article(samantha, yorker, "Citywide Shoe Sale")
+        assert Article.search("shoe") == [articles[1], latest]
+
+        articles[1].magazine = yorker
+        assert Article.search("shoe", magazine=vogue) == []
+        assert Article.search("shoe", magazine=yorker) == [articles[1], latest]
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+from lib.classes.indexes import ArticleIndex
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import Registry
+from lib.classes.snapshot import load, save
+from lib.classes.store import ArticleStore
+
+# Fixture for clearing global state before and after every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+class TestSnapshot:
+
+    def test_round_trip(self, tmp_path):
+        a1 = Author("Carrie Bradshaw")
+        a2 = Author("Samantha Jones")
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("The New Yorker", "News")
+        Magazine("Empty Mag", "Niche")
+        a1.add_articles([(m1, "The Dress Dilemma"), (m1, "Shoes and the City"),
+                         (m1, "Finding Mr. Big"), (m2, "Coffee Shop Review")])
+        a2.add_article(m2, "Dating in NYC: Café")
+
+        path = tmp_path / "catalog.snap"
+        save(path)
+        Article.all, Author.all, Magazine.all = [], [], []
+
+        articles = load(path)
+        assert [article.title for article in articles] == [
+            "The Dress Dilemma", "Shoes and the City", "Finding Mr. Big",
+            "Coffee Shop Review", "Dating in NYC: Café"]
+        assert [author.name for author in Author.all] == ["Carrie Bradshaw", "Samantha Jones"]
+        assert [(m.name, m.category) for m in Magazine.all] == [
+            ("Vogue", "Fashion"), ("The New Yorker", "News"), ("Empty Mag", "Niche")]
+
+        carrie = Author.find_by_name("Carrie Bradshaw")
+        vogue = Magazine.find_by_name("Vogue")
+        assert len(carrie.articles) == 4
+        assert vogue.contributing_authors() == [carrie]
+        assert Magazine.top_publisher() is vogue
+        assert sorted(carrie.topic_areas()) == ["Fashion", "News"]
+
+        # Restored objects keep the usual write-once behavior
+        with pytest.raises(AttributeError):
+            articles[0].title = "Another Title"
+
+    def test_load_builds_the_indexes(self, tmp_path):
+        authors = [Author(f"Author {number}") for number in range(7)]
+        magazines = [Magazine(f"Magazine {number}", f"Category {number % 3}")
+                     for number in range(5)]
+        rng = random.Random(0)
+        Article.bulk_create([(rng.choice(authors), rng.choice(magazines), f"Article {number}")
+                             for number in range(3000)])
+        path = tmp_path / "catalog.snap"
+        save(path)
+        Article.all, Author.all, Magazine.all = [], [], []
+
+        articles = load(path)
+        index = Registry.current().article_index
+        assert index._followed is articles and index._size == len(articles)
+
+        # Built in bulk, the index ends up as if the articles came one by one
+        expected = ArticleIndex(lambda: articles)
+        for article in articles:
+            expected.add(article)
+        for name in ("by_author", "by_magazine", "authors_by_magazine",
+                     "magazines_by_author", "categories_by_author"):
+            built, added = getattr(index, name), getattr(expected, name)
+            assert list(built) == list(added)
+            assert all(list(built[key].items()) == list(added[key].items()) for key in built)
+        assert index.magazine_counts.most_common(5) == expected.magazine_counts.most_common(5)
+        assert index.author_counts.most_common(7) == expected.author_counts.most_common(7)
+        since = articles[1500]._seq
+        assert index.windows.counts("author", since) == expected.windows.counts("author", since)
+        assert index.search("article 2999", None, None, True, False) == [articles[-1]]
+
+    def test_load_keeps_article_store(self, tmp_path):
+        Author("Bob").add_article(Magazine("Vogue", "Fashion"), "Fashion Tips")
+        path = tmp_path / "catalog.snap"
+        save(path)
+
+        Article.all = ArticleStore()
+        load(path)
+        assert isinstance(Article.all, ArticleStore)
+        assert Article.all.top_publisher().name == "Vogue"
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not.snap"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(Exception):
+            load(path)
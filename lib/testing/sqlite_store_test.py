@@ -0,0 +1,241 @@
+import gc
+import random
+import sqlite3
+
+import pytest
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.registry import Registry
+from lib.classes.sqlite_store import SQLiteStore
+
+WORDS = ["fashion", "tips", "city", "design", "review", "guide", "travel"]
+
+# Fixture for swapping a SQLite store in for Article.all around every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown(tmp_path):
+    Author.all = []
+    Magazine.all = []
+    store = Article.all = SQLiteStore(path=str(tmp_path / "catalog.db"), batch_size=8)
+    yield
+    if isinstance(Article.all, SQLiteStore):
+        Article.all.close()
+    store.close()
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+@pytest.fixture
+def catalog():
+    m1 = Magazine("Vogue", "Fashion")
+    m2 = Magazine("AD", "Architecture")
+    a1 = Author("Bob")
+    a2 = Author("Alice")
+    Article.bulk_create([
+        (a1, m1, "Fashion Tips"),
+        (a1, m1, "More Fashion Tips"),
+        (a1, m1, "Yet Another Tip"),
+        (a2, m1, "Alice on Fashion"),
+        (a2, m2, "Architecture Guide"),
+    ])
+    return m1, m2, a1, a2
+
+def answers(seed):
+    # The catalog API's answers for one random catalog, by name and title
+    rng = random.Random(seed)
+    authors = [Author(f"Author {number}") for number in range(6)]
+    magazines = [Magazine(f"Magazine {number}", f"Category {number % 3}") for number in range(4)]
+    articles = Article.bulk_create([
+        (rng.choice(authors), rng.choice(magazines),
+         f"{rng.choice(WORDS)} {rng.choice(WORDS)} {number}") for number in range(300)])
+    for article in articles[::11]:
+        article.delete()
+    magazines[0].category = "Category 9"
+    since = articles[150].seq
+    first = authors[0].articles_page(limit=10, order="title")
+
+    def names(entities):
+        return None if entities is None else [entity.name for entity in entities]
+
+    def titles(found):
+        return [article.title for article in found]
+
+    return {
+        "articles": [titles(author.articles) for author in authors],
+        "magazine_articles": [titles(magazine.articles) for magazine in magazines],
+        # After deletes these lists may come back in another order
+        "magazines": [sorted(names(author.magazines)) for author in authors],
+        "contributors": [sorted(names(magazine.contributors)) for magazine in magazines],
+        "topic_areas": [sorted(author.topic_areas()) for author in authors],
+        "topic_areas_all": [sorted(areas) for areas in Author.topic_areas_all().values()],
+        "contributing": [names(magazine.contributing_authors(12)) for magazine in magazines],
+        "contributing_all": [names(found) for found in
+                             Magazine.contributing_authors_all(12).values()],
+        "contributions": [magazine.contributions(authors[1]) for magazine in magazines],
+        "titles": [magazine.article_titles(order="title") for magazine in magazines],
+        "top_publisher": Magazine.top_publisher().name,
+        "top_publishers": names(Magazine.top_publishers(3)),
+        "top_since": names(Magazine.top_publishers(3, since=since)),
+        "most_prolific": names(Author.most_prolific(3)),
+        "prolific_since": names(Author.most_prolific(3, since=since)),
+        "pages": [titles(first.articles),
+                  titles(authors[0].articles_page(after=first.next_cursor, order="title").articles),
+                  titles(authors[1].articles_page(limit=5).articles)],
+        "has_articles": [magazine.has_articles() for magazine in magazines],
+        "search": [titles(Article.search("city")), titles(Article.search("tr")),
+                   titles(Article.search("desing", prefix=False, fuzzy=True)),
+                   titles(Article.search("guide", magazine=magazines[1]))],
+    }
+
+class TestSQLiteStore:
+
+    def test_behaves_like_article_all(self, catalog):
+        m1, m2, a1, a2 = catalog
+        assert len(Article.all) == 5
+        assert Article.all[0].title == "Fashion Tips"
+        assert a1.articles == list(Article.all)[:3]
+        assert m1.contributors == [a1, a2]
+        assert Magazine.top_publisher() is m1
+
+    def test_sql_aggregates(self, catalog):
+        m1, m2, a1, a2 = catalog
+        store = Article.all
+        assert store.articles_of(a1) == a1.articles
+        assert store.contributors_of(m1) == [a1, a2]
+        assert store.magazine_counts() == {m1: 4, m2: 1}
+        assert store.author_counts(m1) == {a1: 3, a2: 1}
+        assert store.top_publisher() is m1
+        assert store.contributing_authors(m1) == [a1]
+        assert store.contributing_authors(m1, threshold=0) == [a1, a2]
+        assert store.contributing_authors(m2) is None
+        assert store.by_category("Architecture") == [m2]
+
+    def test_answers_match_the_in_memory_index(self, tmp_path):
+        with Registry():
+            in_memory = answers(0)
+        with Registry():
+            store = Article.all = SQLiteStore(path=str(tmp_path / "other.db"))
+            try:
+                from_sql = answers(0)
+            finally:
+                store.close()
+        assert from_sql == in_memory
+
+    def test_articles_stay_on_disk(self, catalog):
+        m1, m2, a1, a2 = catalog
+        store = Article.all
+        gc.collect()
+        assert len(store) == 5 and not store._by_id
+
+        assert [article.title for article in a1.articles] == [
+            "Fashion Tips", "More Fashion Tips", "Yet Another Tip"]
+        assert m1.contributors == [a1, a2]
+        assert m1.contributing_authors() == [a1]
+        assert Magazine.top_publisher() is m1
+        assert Registry.current().article_index is store.article_index
+        # The in-memory index never read the store
+        assert Registry.current()._article_index._followed is not store
+
+        # An article is the same object for as long as someone holds it
+        article = a2.articles[0]
+        assert m1.articles[-1] is article
+        del article
+        gc.collect()
+        assert not store._by_id
+
+    def test_migrating_releases_the_in_memory_index(self, tmp_path):
+        Article.all.close()
+        Article.all = []
+        author = Author("Bob")
+        magazine = Magazine("Vogue", "Fashion")
+        Article.bulk_create([(author, magazine, f"Tip {number}") for number in range(1000)])
+        assert Magazine.top_publisher() is magazine
+        index = Registry.current()._article_index
+        assert index._followed is Article.all
+
+        store = Article.all = SQLiteStore(Article.all, path=str(tmp_path / "migrated.db"))
+        gc.collect()
+        assert not store._by_id
+        assert index._followed is None and index._size == 0
+        assert len(store) == 1000 and Magazine.top_publisher() is magazine
+        assert author.articles_page(limit=1).articles[0].title == "Tip 0"
+
+    def test_deletes_leave_other_rows_alone(self, catalog, tmp_path):
+        m1, m2, a1, a2 = catalog
+        store = Article.all
+        store.flush()
+        ids = [row for row, in store._connection.execute("SELECT id FROM articles ORDER BY id")]
+        store.clear = None  # Deleting must never rebuild the tables
+
+        assert Article.delete_where(lambda article: article.title == "More Fashion Tips") == 1
+        Article.compact()
+        del Article.all[0]
+        store.flush()
+        with sqlite3.connect(str(tmp_path / "catalog.db")) as reader:
+            remaining = [row for row, in reader.execute("SELECT id FROM articles ORDER BY id")]
+            words = reader.execute("SELECT COUNT(*) FROM title_words WHERE word = 'more'")
+            assert words.fetchone() == (0,)
+        assert remaining == [ids[2], ids[3], ids[4]]
+        assert len(store) == 3
+        assert [article.title for article in a1.articles] == ["Yet Another Tip"]
+
+    def test_queries_use_the_indexes(self, catalog):
+        plan = Article.all._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT author_id FROM articles WHERE magazine_id = ? "
+            "GROUP BY author_id HAVING COUNT(*) > ?", (0, 2)).fetchall()
+        assert any("articles_by_magazine" in row[-1] for row in plan)
+
+    def test_writes_follow_reassignment_and_deletes(self, catalog):
+        m1, m2, a1, a2 = catalog
+        article = a1.articles[0]
+        article.magazine = m2
+        article.author = a2
+        m2.category = "Design"
+        a1.articles[0].delete()
+
+        store = Article.all
+        assert store.author_counts(m1) == {a1: 1, a2: 1}
+        assert store.author_counts(m2) == {a2: 2}
+        assert store.by_category("Design") == [m2]
+        assert store.magazine_counts() == {m1: 2, m2: 2}
+
+    def test_open_restores_the_catalog(self, catalog, tmp_path):
+        m1, m2, a1, a2 = catalog
+        m1.name = "Vogue Paris"
+        Author("Idle")
+        Magazine("Empty Mag", "Niche")
+        Article.all.close()
+
+        store = SQLiteStore.open(str(tmp_path / "catalog.db"))
+        assert Article.all is store
+        assert [author.name for author in Author.all] == ["Bob", "Alice", "Idle"]
+        assert [magazine.name for magazine in Magazine.all] == [
+            "Vogue Paris", "AD", "Empty Mag",
+        ]
+        assert Author.find_by_name("Idle").articles == []
+        assert Magazine.find_by_name("Empty Mag").category == "Niche"
+        assert [article.title for article in Article.all] == [
+            "Fashion Tips", "More Fashion Tips", "Yet Another Tip",
+            "Alice on Fashion", "Architecture Guide",
+        ]
+        bob = Author.find_by_name("Bob")
+        vogue = Magazine.find_by_name("Vogue Paris")
+        assert Magazine.top_publisher() is store.top_publisher() is vogue
+        assert vogue.contributing_authors() == [bob]
+
+        new = Article(bob, vogue, "Back in Paris")
+        store.flush()
+        assert store.articles_of(bob)[-1] is new
+
+    def test_writes_are_batched(self, tmp_path):
+        store = Article.all
+        author = Author("Bob")
+        magazine = Magazine("Vogue", "Fashion")
+        Article(author, magazine, "Fashion Tips")
+        with sqlite3.connect(str(tmp_path / "catalog.db")) as reader:
+            assert reader.execute("SELECT COUNT(*) FROM articles").fetchone() == (0,)
+            store.flush()
+            assert reader.execute("SELECT COUNT(*) FROM articles").fetchone() == (1,)
+
+    def test_refuses_to_overwrite_a_catalog(self, catalog, tmp_path):
+        Article.all.flush()
+        with pytest.raises(Exception):
+            SQLiteStore(path=str(tmp_path / "catalog.db"))
@@ -0,0 +1,95 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from lib.classes import analytics
+from lib.classes.many_to_many import Article, Author, Magazine
+from lib.classes.store import ArticleStore
+
+# Fixture for swapping the columnar store in for Article.all around every test
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    Article.all = ArticleStore()
+    Author.all = []
+    Magazine.all = []
+    yield
+    Article.all = []
+    Author.all = []
+    Magazine.all = []
+
+class TestArticleStore:
+
+    def test_behaves_like_article_all(self):
+        a = Author("Bob")
+        m = Magazine("Vogue", "Fashion")
+        first = Article(a, m, "Fashion Tips")
+        second = a.add_article(m, "More Fashion Tips")
+
+        assert len(Article.all) == 2
+        assert list(Article.all) == [first, second]
+        assert Article.all[-1] is second
+        assert second in Article.all
+        assert a.articles == [first, second]
+        assert m.article_titles() == ["Fashion Tips", "More Fashion Tips"]
+
+        Article.all.clear()
+        assert a.articles == []
+        assert Magazine.top_publisher() is None
+
+    def test_vectorized_aggregates(self):
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a1 = Author("Bob")
+        a2 = Author("Alice")
+        Article.bulk_create([
+            (a1, m1, "Fashion Tips"),
+            (a1, m1, "More Fashion Tips"),
+            (a1, m1, "Yet Another Tip"),
+            (a2, m1, "Alice on Fashion"),
+            (a2, m2, "Architecture Guide"),
+        ])
+
+        store = Article.all
+        assert store.magazine_counts() == {m1: 4, m2: 1}
+        assert store.author_counts(m1) == {a1: 3, a2: 1}
+        assert store.top_publisher() is Magazine.top_publisher() is m1
+        assert store.contributing_authors(m1) == m1.contributing_authors() == [a1]
+        assert store.contributing_authors(m2) is None
+
+    def test_top_publisher_ties_match_the_index(self):
+        m1 = Magazine("One", "Fashion")
+        m2 = Magazine("Two", "Architecture")
+        a = Author("Bob")
+        Article.bulk_create([(a, m1, "Fashion Tips"), (a, m2, "Architecture Guide"),
+                             (a, m2, "Building Guide"), (a, m1, "More Fashion Tips")])
+
+        # Both have two articles; m2 got there first
+        with ThreadPoolExecutor(1) as pool:
+            assert Article.all.top_publisher() is Magazine.top_publisher() is \
+                analytics.top_publisher(executor=pool) is m2
+
+    def test_columns_follow_reassignment(self):
+        m1 = Magazine("Vogue", "Fashion")
+        m2 = Magazine("AD", "Architecture")
+        a1 = Author("Bob")
+        a2 = Author("Alice")
+        article = Article(a1, m1, "Fashion Tips")
+        Article(a1, m2, "Architecture Guide")
+        Article(a1, m2, "More Architecture")
+
+        article.author = a2
+        article.magazine = m2
+        assert Article.all.author_counts(m2) == {a1: 2, a2: 1}
+        assert Article.all.magazine_counts() == {m2: 3}
+
+    def test_delete_masks_rows_until_compaction(self):
+        m = Magazine("Vogue", "Fashion")
+        a = Author("Bob")
+        articles = a.add_articles([(m, f"Fashion Tip {i}") for i in range(20)])
+
+        articles[0].delete()
+        assert len(Article.all) == 20
+        assert Article.all.magazine_counts() == {m: 19}
+        Article.compact()
+        assert isinstance(Article.all, ArticleStore)
+        assert len(Article.all) == 19
+        assert Article.all.author_counts(m) == {a: 19}